@@ -0,0 +1,115 @@
+"""
+无界面批量生成座位表（不依赖Qt）
+
+用法:
+    python batch.py --pair 名单.json 布局.json --pair 名单2.xlsx 布局2.json --output out
+    python batch.py --jobs jobs.json --output out      # jobs.json: [["名单.json", "布局.json"], ...]
+    python batch.py --pair 名单.json 布局.json --export xlsx --export pdf
+                                                        # 同时导出为表格/图片（png、pdf需要PySide6）
+
+每组名单/布局在进程池中并行生成，结果各写为一个JSON文件
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import lib
+
+
+def load_roster(path) -> list:
+    """按扩展名读取学生列表（.xlsx、.roster或.json）"""
+    stu_op = lib.Student_Operate()
+    stu_op.read(path)
+    return stu_op.get_stu_list()
+
+
+def run_job(roster_path, layout_path, output_path, formats=()) -> dict:
+    """
+    进程池任务：生成一张座位表并写入output_path，返回摘要
+
+    formats为额外导出的格式（如"xlsx"），文件与output_path同名
+    读取或导出出错时不抛出异常，错误信息同样写入output_path并返回
+    """
+    data = {
+        "roster": roster_path,
+        "layout": layout_path,
+        "time": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
+    }
+    try:
+        layout = lib.Layout_Connector(layout_path)
+        stu_list = load_roster(roster_path)
+        classs = lib.Compact_Classs(layout)
+
+        # 失败写错误代码，成功写结果
+        final = classs.check(stu_list)
+        if final == False:
+            classs.random(stu_list)
+            data["display_unit"] = list(classs.display_unit())
+            data["ways"] = classs.way_gather()
+            data["result"] = classs.get_result().dump()
+            data["record"] = lib.Replay_Record.create(layout, stu_list, classs.seed, classs.mode).dump()
+            if formats:
+                import exporter
+                stem = os.path.splitext(output_path)[0]
+                for fmt in formats:
+                    exporter.export_classs(f"{stem}.{fmt}", classs)
+        else:
+            data["error"] = final
+    except Exception as e:
+        for key in ("display_unit", "ways", "result", "record"):
+            data.pop(key, None)
+        data["error"] = f"{type(e).__name__}: {e}"
+
+    with open(output_path, 'w', encoding='utf-8') as j:
+        json.dump(data, j, ensure_ascii=False)
+    return {"output": output_path, "error": data.get("error")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="无界面批量生成座位表")
+    parser.add_argument("--pair", nargs=2, action="append", default=[],
+                        metavar=("ROSTER", "LAYOUT"), help="一组学生列表和布局，可重复")
+    parser.add_argument("--jobs", help="JSON文件，内容为[[学生列表, 布局], ...]")
+    parser.add_argument("--output", default="output", help="结果文件夹")
+    parser.add_argument("--export", action="append", default=[],
+                        choices=["csv", "xlsx", "png", "pdf"],
+                        help="额外导出的格式，可重复")
+    parser.add_argument("--processes", type=int, default=None, help="进程数，默认为CPU核心数")
+    args = parser.parse_args()
+
+    pairs = [tuple(pair) for pair in args.pair]
+    if args.jobs:
+        with open(args.jobs, 'r', encoding='utf-8') as j:
+            pairs.extend(tuple(pair) for pair in json.load(j))
+    if not pairs:
+        parser.error("至少需要一组--pair或--jobs")
+
+    os.makedirs(args.output, exist_ok=True)
+    outputs = []
+    for index, (roster_path, layout_path) in enumerate(pairs):
+        roster_name = os.path.splitext(os.path.basename(roster_path))[0]
+        layout_name = os.path.splitext(os.path.basename(layout_path))[0]
+        outputs.append(os.path.join(args.output, f"{index:04d}_{roster_name}_{layout_name}.json"))
+
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.processes) as pool:
+        rosters, layouts = zip(*pairs)
+        formats = [tuple(args.export)]*len(pairs)
+        for summary in pool.map(run_job, rosters, layouts, outputs, formats):
+            if summary["error"] is not None:
+                failed += 1
+                error = summary["error"]
+                text = f"错误代码 {error}" if isinstance(error, int) else error
+                print(f"{summary['output']}: {text}", file=sys.stderr)
+            else:
+                print(summary["output"])
+
+    print(f"共{len(pairs)}组，成功{len(pairs)-failed}组，失败{failed}组", file=sys.stderr)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+lib核心性能基准
+
+用法:
+    python benchmark.py                                  # 运行全部规模并打印JSON
+    python benchmark.py --output result.json             # 保存结果
+    python benchmark.py --baseline old.json --tolerance 0.3
+                                                         # 与旧结果对比，变慢超过30%（且超过0.05毫秒）时退出码为1
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+import lib
+
+
+SIZES = [40, 400, 5000, 50000]  # 座位数
+FILL_RATE = 0.9  # 学生数占座位数的比例
+
+
+def make_layout(seats: int) -> dict:
+    """生成座位数为seats的布局，每两列座位之间有一条过道"""
+    rows = max(8, round(math.sqrt(seats/2)))
+    columns = []
+    left = seats
+    while left > 0:
+        length = min(rows, left)
+        columns.append({"type": "seats", "start": 0, "length": length, "text": ""})
+        left -= length
+        if len(columns) % 3 == 2 and left > 0:
+            columns.append({"type": "way", "start": 0, "length": 0, "text": "过道"})
+    return {"name": f"bench_{seats}", "time": "", "map": columns}
+
+
+def make_roster(count: int) -> list:
+    """生成count名学生"""
+    return [{"name": f"学生{i}", "id": str(20000000+i), "sex": i % 2 == 0} for i in range(count)]
+
+
+def write_files(folder, seats: int) -> tuple:
+    """写出布局JSON、名单JSON和名单Excel，返回三个路径"""
+    layout_path = os.path.join(folder, f"layout_{seats}.json")
+    with open(layout_path, 'w', encoding='utf-8') as j:
+        json.dump(make_layout(seats), j, ensure_ascii=False)
+
+    roster = make_roster(int(seats*FILL_RATE))
+    json_path = os.path.join(folder, f"roster_{seats}.json")
+    with open(json_path, 'w', encoding='utf-8') as j:
+        json.dump({"name": f"bench_{seats}", "time": "", "stu_list": roster}, j)
+
+    # 与名单模板格式相同：表头、示例行、数据
+    import openpyxl
+    xlsx_path = os.path.join(folder, f"roster_{seats}.xlsx")
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(["姓名", "学号", "性别"])
+    sheet.append(["张三", 20010101, "男"])
+    for stu in roster:
+        sheet.append([stu["name"], int(stu["id"]), "男" if stu["sex"] else "女"])
+    workbook.save(xlsx_path)
+
+    return layout_path, json_path, xlsx_path
+
+
+def measure(func, repeat: int) -> dict:
+    """运行func共repeat次，返回耗时统计（毫秒）"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return {
+        "best_ms": round(min(times), 4),
+        "median_ms": round(statistics.median(times), 4),
+        "repeat": repeat
+    }
+
+
+def run_size(folder, seats: int, repeat: int) -> list:
+    """对一种规模运行全部基准"""
+    layout_path, json_path, xlsx_path = write_files(folder, seats)
+    layout = lib.Layout_Connector(layout_path)
+    stu_op = lib.Student_Operate()
+    stu_op.read_from_json(json_path)
+    stu_list = stu_op.get_stu_list()
+
+    def read_json():
+        lib.Student_Operate().read_from_json(json_path)
+
+    def read_xlsx():
+        lib.Student_Operate().read_from_xlsx(xlsx_path)
+
+    # 同一个实例反复随机，不把创建Classs的耗时计入random
+    randomized = lib.Classs(layout)
+    randomized.random(stu_list)
+
+    def random():
+        randomized.random(stu_list)
+
+    cases = [
+        ("Layout_Connector", lambda: lib.Layout_Connector(layout_path), repeat),
+        ("Classs", lambda: lib.Classs(layout), repeat),
+        ("check", lambda: randomized.check(stu_list), repeat),
+        ("random", random, repeat),
+        ("get_processed_data", randomized.get_processed_data, repeat),
+        ("read_from_json", read_json, repeat),
+        # Excel读取较慢，减少次数
+        ("read_from_xlsx", read_xlsx, min(repeat, 3)),
+    ]
+
+    results = []
+    for name, func, times in cases:
+        func()  # 预热
+        result = {"name": name, "seats": seats}
+        result.update(measure(func, times))
+        results.append(result)
+        print(f"{name:>20} {seats:>6} {result['median_ms']:>12.3f} ms", file=sys.stderr)
+    return results
+
+
+def compare(results: list, baseline: list, tolerance: float, floor: float = 0.05) -> list:
+    """
+    返回中位数耗时比基准慢超过tolerance的项目
+
+    绝对差值不超过floor毫秒的不计入，避免微秒级项目的抖动被当作变慢
+    """
+    old = {(i["name"], i["seats"]): i for i in baseline}
+    regressions = []
+    for item in results:
+        before = old.get((item["name"], item["seats"]))
+        if before is None:
+            continue
+        if item["median_ms"] > before["median_ms"] * (1 + tolerance) and \
+                item["median_ms"] - before["median_ms"] > floor:
+            regressions.append({
+                "name": item["name"],
+                "seats": item["seats"],
+                "baseline_ms": before["median_ms"],
+                "median_ms": item["median_ms"]
+            })
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="lib核心性能基准")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="座位数列表")
+    parser.add_argument("--repeat", type=int, default=10, help="每项重复次数")
+    parser.add_argument("--output", help="结果JSON保存路径")
+    parser.add_argument("--baseline", help="用于对比的旧结果JSON")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="允许的变慢比例")
+    parser.add_argument("--floor", type=float, default=0.05, help="忽略的绝对变慢毫秒数")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as folder:
+        for seats in args.sizes:
+            results.extend(run_size(folder, seats, args.repeat))
+
+    report = {
+        "time": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results
+    }
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as j:
+            baseline = json.load(j)["results"]
+        report["regressions"] = compare(results, baseline, args.tolerance, args.floor)
+        if report["regressions"]:
+            exit_code = 1
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as j:
+            j.write(text)
+    else:
+        print(text)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
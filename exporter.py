@@ -0,0 +1,273 @@
+"""
+座位表导出：CSV、XLSX、PNG、PDF
+
+按行流式写出，不构建整张表的中间数据；CSV、XLSX不依赖Qt，
+PNG、PDF使用离屏绘制，无需显示窗口；绘制可在非界面线程中进行，但同一时间只绘制一张，
+且QGuiApplication必须已在主线程中创建
+"""
+import csv
+import math
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import lib
+
+
+FORMATS = (".csv", ".xlsx", ".png", ".pdf")
+
+MALE_COLOR = "#87CEEB"
+FEMALE_COLOR = "#FFB6C1"
+HEAD_COLOR = "#C7C7C7"
+
+
+def iter_rows(result: lib.Seating_Result, display_unit: tuple):
+    """
+    逐行输出座位表，第0行为讲台
+
+    每行为长度等于列数的列表，元素为Student或None
+    """
+    (columns, rows) = display_unit
+    seat_of = {}
+    for x, y, stu in result:
+        seat_of[(x, y)] = stu
+    for y in range(rows-1):
+        yield [seat_of.get((x, y)) for x in range(columns)]
+
+
+def iter_text_rows(result: lib.Seating_Result, display_unit: tuple):
+    """逐行输出座位表文字，第一行为讲台"""
+    (columns, rows) = display_unit
+    yield ["讲台"] + [""]*(columns-1)
+    for row in iter_rows(result, display_unit):
+        yield ["" if stu is None else stu.name for stu in row]
+
+
+def write_csv(path, result: lib.Seating_Result, display_unit: tuple, ways: list) -> None:
+    """导出为CSV（UTF-8 BOM，Excel可直接打开）"""
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        for row in iter_text_rows(result, display_unit):
+            writer.writerow(row)
+
+
+def write_xlsx(path, result: lib.Seating_Result, display_unit: tuple, ways: list) -> None:
+    """导出为XLSX，使用openpyxl的只写模式逐行写出"""
+    import openpyxl
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Font, PatternFill
+    from openpyxl.utils import get_column_letter
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet("座位表")
+    center = Alignment(horizontal="center", vertical="center")
+    fills = {
+        True: PatternFill("solid", fgColor=MALE_COLOR[1:]),
+        False: PatternFill("solid", fgColor=FEMALE_COLOR[1:])
+    }
+
+    (columns, rows) = display_unit
+    head = WriteOnlyCell(sheet, value="讲台")
+    head.font = Font(bold=True)
+    head.alignment = center
+    head.fill = PatternFill("solid", fgColor=HEAD_COLOR[1:])
+    sheet.append([head])
+    if columns > 1:
+        sheet.merged_cells.add(f"A1:{get_column_letter(columns)}1")
+
+    for row in iter_rows(result, display_unit):
+        cells = []
+        for stu in row:
+            if stu is None:
+                cells.append(None)
+                continue
+            cell = WriteOnlyCell(sheet, value=stu.name)
+            cell.alignment = center
+            cell.fill = fills[bool(stu.sex)]
+            cells.append(cell)
+        sheet.append(cells)
+    workbook.save(path)
+
+
+_app = None  # 无界面环境下创建的QGuiApplication
+_paint_lock = threading.Lock()  # Qt绘制不能并行，PNG/PDF逐个导出
+
+
+def _ensure_gui():
+    """
+    PNG/PDF绘制需要QGuiApplication，无界面环境下以离屏模式创建
+
+    只能在主线程中创建；在其他线程中调用且尚未创建时抛出RuntimeError
+    """
+    global _app
+    from PySide6.QtGui import QGuiApplication
+    if QGuiApplication.instance() is None:
+        if threading.current_thread() is not threading.main_thread():
+            raise RuntimeError("导出PNG/PDF前需要在主线程中创建QGuiApplication")
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        _app = QGuiApplication([])
+
+
+class _Painter_Layout():
+    """绘制尺寸：与ResultWindow默认缩放下的比例一致"""
+
+    def __init__(self, result: lib.Seating_Result, display_unit: tuple, ways: list, name_pixel: int) -> None:
+        (self.columns, self.rows) = display_unit
+        max_length = max([len(stu.name) for _, _, stu in result] or [1])
+        self.name_pixel = name_pixel
+        self.head_pixel = int(name_pixel*1.4)
+        self.head_height = int(self.head_pixel*2)
+        self.cell_width = int(max_length*name_pixel*1.7)
+        self.cell_height = int(name_pixel*1.4)
+
+        # 每列的左边界，过道列较窄
+        way_set = set(ways)
+        self.lefts = [0]
+        for x in range(self.columns):
+            width = int(self.cell_width*0.6) if x in way_set else self.cell_width
+            self.lefts.append(self.lefts[-1] + width)
+        self.width = self.lefts[-1]
+        self.height = self.head_height + (self.rows-1)*self.cell_height
+
+    def fonts(self) -> tuple:
+        from PySide6.QtGui import QFont
+        head_font = QFont("Microsoft YaHei")
+        head_font.setBold(True)
+        head_font.setPixelSize(self.head_pixel)
+        name_font = QFont("KaiTi")
+        name_font.setPixelSize(self.name_pixel)
+        return head_font, name_font
+
+    def draw_head(self, painter, top: int) -> None:
+        from PySide6.QtCore import QRect, Qt
+        from PySide6.QtGui import QColor
+        rect = QRect(0, top, self.width, self.head_height)
+        painter.fillRect(rect, QColor(HEAD_COLOR))
+        painter.drawRect(rect)
+        painter.drawText(rect, Qt.AlignCenter, "讲台")
+
+    def draw_row(self, painter, top: int, row: list) -> None:
+        from PySide6.QtCore import QRect, Qt
+        from PySide6.QtGui import QColor
+        for x, stu in enumerate(row):
+            if stu is None:
+                continue
+            rect = QRect(self.lefts[x], top, self.lefts[x+1]-self.lefts[x], self.cell_height)
+            painter.fillRect(rect, QColor(MALE_COLOR if stu.sex else FEMALE_COLOR))
+            painter.drawRect(rect)
+            painter.drawText(rect, Qt.AlignCenter, stu.name)
+
+
+MAX_IMAGE_SIDE = 32767  # QPainter光栅绘制的坐标上限
+MAX_IMAGE_PIXELS = 32_000_000  # PNG图片的像素上限，RGB32约128MB
+
+
+def png_scale(width: int, height: int) -> float:
+    """图片超过边长或像素上限时的缩小比例，未超过时为1"""
+    width, height = max(width, 1)+1, height+1
+    return min(1.0, MAX_IMAGE_SIDE/width, MAX_IMAGE_SIDE/height, math.sqrt(MAX_IMAGE_PIXELS/(width*height)))
+
+
+def write_png(path, result: lib.Seating_Result, display_unit: tuple, ways: list, name_pixel: int = 25) -> None:
+    """离屏绘制为PNG图片，座位过多时整体缩小到MAX_IMAGE_PIXELS以内"""
+    _ensure_gui()
+    from PySide6.QtGui import QColor, QImage, QPainter
+
+    with _paint_lock:
+        layout = _Painter_Layout(result, display_unit, ways, name_pixel)
+        head_font, name_font = layout.fonts()
+        scale = png_scale(layout.width, layout.height)
+        width, height = int((max(layout.width, 1)+1)*scale), int((layout.height+1)*scale)
+        image = QImage(width, height, QImage.Format_RGB32)
+        if image.isNull():
+            raise MemoryError(f"无法创建{width}×{height}的图片")
+        image.fill(QColor("white"))
+
+        painter = QPainter(image)
+        painter.scale(scale, scale)
+        painter.setFont(head_font)
+        layout.draw_head(painter, 0)
+        painter.setFont(name_font)
+        top = layout.head_height
+        for row in iter_rows(result, display_unit):
+            layout.draw_row(painter, top, row)
+            top += layout.cell_height
+        painter.end()
+        if not image.save(path, "PNG"):
+            raise OSError(f"无法保存PNG图片: {path}")
+
+
+def write_pdf(path, result: lib.Seating_Result, display_unit: tuple, ways: list, name_pixel: int = 25) -> None:
+    """离屏绘制为PDF，宽度缩放到A4横向页面，行数过多时自动分页"""
+    _ensure_gui()
+    from PySide6.QtGui import QPageLayout, QPageSize, QPainter, QPdfWriter
+
+    with _paint_lock:
+        layout = _Painter_Layout(result, display_unit, ways, name_pixel)
+        head_font, name_font = layout.fonts()
+        writer = QPdfWriter(path)
+        writer.setPageSize(QPageSize(QPageSize.A4))
+        writer.setPageOrientation(QPageLayout.Landscape)
+
+        painter = QPainter(writer)
+        scale = writer.width() / (layout.width+1)
+        painter.scale(scale, scale)
+        page_height = writer.height() / scale
+
+        painter.setFont(head_font)
+        layout.draw_head(painter, 0)
+        painter.setFont(name_font)
+        top = layout.head_height
+        for row in iter_rows(result, display_unit):
+            if top + layout.cell_height > page_height:
+                writer.newPage()
+                top = 0
+            layout.draw_row(painter, top, row)
+            top += layout.cell_height
+        painter.end()
+
+
+WRITERS = {
+    ".csv": write_csv,
+    ".xlsx": write_xlsx,
+    ".png": write_png,
+    ".pdf": write_pdf
+}
+
+
+def export(path, result: lib.Seating_Result, display_unit: tuple, ways: list) -> str:
+    """按扩展名导出，返回path"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in WRITERS:
+        raise ValueError(f"不支持的导出格式: {ext}")
+    WRITERS[ext](path, result, display_unit, ways)
+    return path
+
+
+def export_classs(path, classs) -> str:
+    """导出已随机的Classs或Compact_Classs"""
+    return export(path, classs.get_result(), classs.display_unit(), classs.way_gather())
+
+
+PAINTED = (".png", ".pdf")  # 需要Qt绘制的格式
+
+
+def submit_exports(jobs: list, max_workers: int = 4) -> list:
+    """
+    后台导出多个座位表，立即返回Future列表（顺序与jobs相同），不阻塞调用线程
+
+    jobs为[(path, result, display_unit, ways), ...]
+    CSV、XLSX在max_workers个线程中并行导出；PNG、PDF在单独的一个线程中逐个绘制
+    含PNG/PDF时需在主线程中调用，以便先创建QGuiApplication
+    """
+    painted = [os.path.splitext(job[0])[1].lower() in PAINTED for job in jobs]
+    if any(painted):
+        _ensure_gui()
+
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    paint_pool = ThreadPoolExecutor(max_workers=1)
+    futures = [(paint_pool if is_painted else pool).submit(export, *job)
+               for job, is_painted in zip(jobs, painted)]
+    pool.shutdown(wait=False)
+    paint_pool.shutdown(wait=False)
+    return futures
@@ -0,0 +1,237 @@
+"""
+随机公平性模拟（不依赖Qt）
+
+用法:
+    python fairness.py 名单.json 布局.json                      # 默认模拟100万次
+    python fairness.py 名单.json 布局.json --draws 5000000 --seed 1 --output report.json
+
+对同一布局和名单做大量独立随机（与Classs.random分布相同），统计：
+每名学生坐到每个座位的频率、坐到前排的概率、逐人卡方均匀性检验、相邻同桌的分布
+全部按矩阵分块计算，不逐次调用random
+"""
+import argparse
+import json
+import math
+import sys
+import time
+
+import numpy as np
+
+import lib
+
+
+CHUNK_CELLS = 4_000_000  # 每块最多生成的矩阵元素数，控制内存占用
+PAIR_LIMIT = 2048  # 学生数超过该值时不统计相邻对（矩阵为学生数的平方）
+
+
+def neighbour_pairs(seat_xy: np.ndarray) -> np.ndarray:
+    """返回相邻（曼哈顿距离为1，与Constraint_Solver一致）的可用座位索引对，形状为m×2"""
+    if len(seat_xy) == 0:
+        return np.zeros((0, 2), dtype=np.int64)
+    index = np.full(seat_xy.max(axis=0) + 2, -1, dtype=np.int64)
+    index[seat_xy[:, 0], seat_xy[:, 1]] = np.arange(len(seat_xy))
+    pairs = []
+    for dx, dy in ((1, 0), (0, 1)):
+        other = index[seat_xy[:, 0] + dx, seat_xy[:, 1] + dy]
+        found = np.flatnonzero(other >= 0)
+        pairs.append(np.stack([found, other[found]], axis=1))
+    return np.concatenate(pairs)
+
+
+def chi_square_p(statistic, df) -> np.ndarray:
+    """卡方分布的右尾概率（Wilson-Hilferty近似，自由度较大时足够精确）"""
+    statistic = np.asarray(statistic, dtype=np.float64)
+    if df <= 0:
+        return np.ones_like(statistic)
+    k = 2 / (9*df)
+    z = (np.cbrt(statistic/df) - (1 - k)) / math.sqrt(k)
+    return 0.5 * np.vectorize(math.erfc)(z / math.sqrt(2))
+
+
+def simulate(classs, stu_list: list, draws: int, seed: int = None) -> dict:
+    """
+    对已创建的Classs或Compact_Classs做draws次独立随机
+
+    返回：
+    seat_counts: 学生数×座位数，第i行第j列为第i名学生坐到第j个可用座位的次数
+    pair_counts: 学生数×学生数（上三角），两人相邻的次数；学生过多时为None
+    seat_xy: 可用座位坐标；pairs: 相邻座位索引对；seed: 实际使用的种子
+    检查不通过时返回None
+    """
+    if classs.check(stu_list) != False:
+        return None
+
+    seat_xy = np.array(classs.get_all_avail_seats(), dtype=np.int64).reshape(-1, 2)
+    seats = len(seat_xy)
+    students = len(stu_list)
+    pairs = neighbour_pairs(seat_xy)
+    seed = lib.new_seed() if seed is None else seed
+
+    seat_counts = np.zeros(students*seats, dtype=np.int64)
+    pair_counts = np.zeros(students*students, dtype=np.int64) if students <= PAIR_LIMIT else None
+
+    chunk = max(1, CHUNK_CELLS // seats)
+    chunks = (draws + chunk - 1) // chunk
+    column = np.arange(seats, dtype=np.int64)
+    for child, start in zip(np.random.SeedSequence(seed).spawn(chunks), range(0, draws, chunk)):
+        arrangement = classs.random_batch(stu_list, min(chunk, draws-start), child)
+
+        # (学生, 座位)出现次数
+        taken = arrangement >= 0
+        keys = arrangement.astype(np.int64)*seats + column
+        seat_counts += np.bincount(keys[taken], minlength=students*seats)
+
+        # 相邻对：两座位都有人时计数，较小的学生索引在前
+        if pair_counts is not None and len(pairs):
+            a = arrangement[:, pairs[:, 0]].astype(np.int64)
+            b = arrangement[:, pairs[:, 1]].astype(np.int64)
+            both = (a >= 0) & (b >= 0)
+            a, b = a[both], b[both]
+            keys = np.minimum(a, b)*students + np.maximum(a, b)
+            pair_counts += np.bincount(keys, minlength=students*students)
+
+    return {
+        "seat_counts": seat_counts.reshape(students, seats),
+        "pair_counts": None if pair_counts is None else pair_counts.reshape(students, students),
+        "seat_xy": seat_xy,
+        "pairs": pairs,
+        "draws": draws,
+        "seed": seed
+    }
+
+
+def per_student(stu_list: list, values) -> list:
+    """逐人结果，按学号和姓名列出（姓名可能重复）"""
+    return [{"id": stu_list[i].id, "name": stu_list[i].name, "value": round(float(value), 6)}
+            for i, value in enumerate(values)]
+
+
+def summarize(stats: dict, stu_list: list, front_rows: int = 1, top: int = 10) -> dict:
+    """将simulate的结果整理为可写入JSON的报告"""
+    draws = stats["draws"]
+    seat_counts = stats["seat_counts"]
+    seat_xy = stats["seat_xy"]
+    students, seats = seat_counts.shape
+
+    # 每个(学生, 座位)的理论概率均为1/座位数
+    expected = draws / seats
+    probability = seat_counts / draws
+    chi2 = ((seat_counts - expected)**2 / expected).sum(axis=1)
+    df = seats - 1
+    p_values = chi_square_p(chi2, df)
+    total_p = float(chi_square_p(chi2.sum(), students*df))
+
+    # 前排：离讲台最近的front_rows行
+    front = seat_xy[:, 1] < seat_xy[:, 1].min() + front_rows
+    front_probability = probability[:, front].sum(axis=1)
+
+    report = {
+        "draws": draws,
+        "seed": stats["seed"],
+        "students": students,
+        "seats": seats,
+        "seat_probability": {
+            "expected": 1 / seats,
+            "min": float(probability.min()),
+            "max": float(probability.max()),
+            "max_deviation": float(np.abs(probability - 1/seats).max())
+        },
+        "front_row": {
+            "rows": front_rows,
+            "seats": int(front.sum()),
+            "expected": float(front.sum() / seats),
+            "min": float(front_probability.min()),
+            "max": float(front_probability.max()),
+            "per_student": per_student(stu_list, front_probability)
+        },
+        "chi_square": {
+            "df": df,
+            "total_p_value": total_p,
+            "min_p_value": float(p_values.min()),
+            "below_0.01": int((p_values < 0.01).sum()),
+            "per_student": per_student(stu_list, p_values)
+        },
+        "pairs": None
+    }
+
+    pair_counts = stats["pair_counts"]
+    if pair_counts is not None and students > 1:
+        # 任意两名学生在一次随机中相邻的理论概率
+        pair_expected = draws * 2*len(stats["pairs"]) / (seats*(seats-1))
+        upper = np.triu_indices(students, 1)
+        counts = pair_counts[upper]
+        order = np.argsort(counts)[::-1][:top]
+        pair_chi2 = float(((counts - pair_expected)**2 / pair_expected).sum()) if pair_expected > 0 else 0.0
+        report["pairs"] = {
+            "neighbour_seats": len(stats["pairs"]),
+            "expected": pair_expected,
+            "min": int(counts.min()),
+            "max": int(counts.max()),
+            "mean": float(counts.mean()),
+            "chi_square_p_value": float(chi_square_p(pair_chi2, len(counts)-1)),
+            "most_frequent": [
+                {
+                    "a": {"id": stu_list[int(upper[0][i])].id, "name": stu_list[int(upper[0][i])].name},
+                    "b": {"id": stu_list[int(upper[1][i])].id, "name": stu_list[int(upper[1][i])].name},
+                    "count": int(counts[i])
+                }
+                for i in order
+            ]
+        }
+    return report
+
+
+def print_summary(report: dict) -> None:
+    """打印摘要表"""
+    rows = [
+        ("模拟次数", report["draws"]),
+        ("学生数/座位数", f"{report['students']}/{report['seats']}"),
+        ("单座概率 期望", f"{report['seat_probability']['expected']:.6f}"),
+        ("单座概率 范围", f"{report['seat_probability']['min']:.6f} ~ {report['seat_probability']['max']:.6f}"),
+        ("前排概率 期望", f"{report['front_row']['expected']:.6f}"),
+        ("前排概率 范围", f"{report['front_row']['min']:.6f} ~ {report['front_row']['max']:.6f}"),
+        ("卡方检验 总体p值", f"{report['chi_square']['total_p_value']:.4f}"),
+        ("卡方检验 p<0.01人数", report["chi_square"]["below_0.01"]),
+    ]
+    if report["pairs"] is not None:
+        rows.append(("相邻次数 期望", f"{report['pairs']['expected']:.1f}"))
+        rows.append(("相邻次数 范围", f"{report['pairs']['min']} ~ {report['pairs']['max']}"))
+        rows.append(("相邻分布 p值", f"{report['pairs']['chi_square_p_value']:.4f}"))
+    for name, value in rows:
+        print(f"{name:<16}{value}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="随机公平性模拟")
+    parser.add_argument("roster", help="学生列表（.json、.roster或.xlsx）")
+    parser.add_argument("layout", help="布局JSON")
+    parser.add_argument("--draws", type=int, default=1_000_000, help="模拟次数")
+    parser.add_argument("--seed", type=int, default=None, help="随机种子")
+    parser.add_argument("--front-rows", type=int, default=1, help="计为前排的行数")
+    parser.add_argument("--output", help="报告JSON保存路径")
+    args = parser.parse_args()
+
+    stu_op = lib.Student_Operate()
+    stu_op.read(args.roster)
+    stu_list = stu_op.get_stu_list()
+    classs = lib.Compact_Classs(lib.Layout_Connector(args.layout))
+
+    start = time.perf_counter()
+    stats = simulate(classs, stu_list, args.draws, args.seed)
+    if stats is None:
+        print(f"错误代码 {classs.check(stu_list)}", file=sys.stderr)
+        sys.exit(1)
+    report = summarize(stats, stu_list, args.front_rows)
+    report["elapsed_s"] = round(time.perf_counter() - start, 3)
+    print_summary(report)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as j:
+            j.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,10 @@ import time
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                                QHBoxLayout, QFrame, QComboBox, QLineEdit, QLabel,
                                QMenuBar, QMenu, QMessageBox, QScrollArea, QPushButton,
-                               QSizePolicy, QDialog)
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QAction, QIntValidator
+                               QSizePolicy, QDialog, QGraphicsView, QGraphicsScene,
+                               QGraphicsItem, QStackedWidget, QStyle)
+from PySide6.QtCore import Qt, Signal, QRectF
+from PySide6.QtGui import QAction, QIntValidator, QColor, QPen, QPainter
 
 
 # 座位类型样式
@@ -202,6 +203,152 @@ class ColumnWidget(QFrame):
         self.on_type_changed(type)
 
 
+# 列数超过该值时打开文件自动使用画布模式
+CANVAS_THRESHOLD = 100
+
+# 画布模式中新建列的默认数据
+DEFAULT_COLUMN = {"type": "seats", "length": 6, "start": 0, "text": ""}
+
+
+class ColumnItem(QGraphicsItem):
+    """画布模式中的一列，直接绘制座位，不创建任何控件"""
+
+    SEAT_WIDTH = 60   # 座位列宽度
+    WAY_WIDTH = 30    # 过道列宽度
+    SEAT_HEIGHT = 22  # 单个座位高度
+    HEAD_HEIGHT = 20  # 列号区域高度
+
+    seat_color = QColor("#bae7ff")
+    way_color = QColor("#d9f7be")
+    empty_color = QColor("#f0f0f0")
+
+    def __init__(self, data, number):
+        super().__init__()
+        self.data = data  # 列数据，格式同ColumnWidget.get_data
+        self.number = number  # 列号，从1开始
+        self.setFlag(QGraphicsItem.ItemIsSelectable)
+
+    def width(self):
+        return self.SEAT_WIDTH if self.data["type"] == "seats" else self.WAY_WIDTH
+
+    def height(self):
+        count = self.data["start"] + self.data["length"] if self.data["type"] == "seats" else 0
+        return self.HEAD_HEIGHT + max(count, 1)*self.SEAT_HEIGHT
+
+    def set_data(self, data):
+        self.prepareGeometryChange()
+        self.data = data
+        self.update()
+
+    def boundingRect(self):
+        return QRectF(0, 0, self.width(), self.height())
+
+    def paint(self, painter, option, widget=None):
+        width = self.width()
+        painter.setPen(QPen(Qt.black, 0))
+        painter.drawText(QRectF(0, 0, width, self.HEAD_HEIGHT), Qt.AlignCenter, str(self.number))
+
+        body = QRectF(0, self.HEAD_HEIGHT, width, self.height()-self.HEAD_HEIGHT)
+        if self.data["type"] != "seats":
+            painter.fillRect(body, self.way_color)
+            painter.drawText(body, Qt.AlignCenter | Qt.TextWordWrap, self.data.get("text", ""))
+        elif option.levelOfDetailFromTransform(painter.worldTransform()) < 0.3:
+            # 缩得很小时只画整列，不画单个座位
+            painter.fillRect(body, self.seat_color)
+        else:
+            start = self.data["start"]
+            for i in range(start + self.data["length"]):
+                rect = QRectF(2, self.HEAD_HEIGHT + i*self.SEAT_HEIGHT + 1,
+                              width-4, self.SEAT_HEIGHT-2)
+                painter.fillRect(rect, self.empty_color if i < start else self.seat_color)
+
+        # 选中时加粗边框
+        if option.state & QStyle.State_Selected:
+            painter.setPen(QPen(QColor("#1677ff"), 3))
+        painter.drawRect(body)
+
+
+class LayoutCanvas(QGraphicsView):
+    """画布模式：所有列绘制在同一场景中，只绘制可见部分"""
+    column_selected = Signal(int)  # 选中列的索引，未选中时为-1
+
+    SPACING = 10  # 列间距
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setScene(QGraphicsScene(self))
+        self.setAlignment(Qt.AlignLeft | Qt.AlignTop)
+        self.setRenderHint(QPainter.TextAntialiasing)
+        self.setDragMode(QGraphicsView.RubberBandDrag)
+        self.items = []
+        self.scene().selectionChanged.connect(self.on_selection_changed)
+
+    def set_columns(self, columns):
+        """载入全部列数据"""
+        self.scene().clear()
+        self.items = []
+        for data in columns:
+            item = ColumnItem(dict(data), len(self.items)+1)
+            self.scene().addItem(item)
+            self.items.append(item)
+        self.relayout()
+
+    def get_columns(self):
+        """返回全部列数据"""
+        return [dict(item.data) for item in self.items]
+
+    def relayout(self, start=0):
+        """从第start列起重新排列位置和列号"""
+        x = 0
+        if start > 0:
+            previous = self.items[start-1]
+            x = previous.x() + previous.width() + self.SPACING
+        for index in range(start, len(self.items)):
+            item = self.items[index]
+            item.number = index+1
+            item.setPos(x, 0)
+            item.update()
+            x += item.width() + self.SPACING
+        height = max([item.height() for item in self.items] or [0])
+        self.scene().setSceneRect(0, 0, max(x, 1), height)
+
+    def selected_index(self):
+        """当前选中列的索引，未选中或多选时为-1"""
+        selected = self.scene().selectedItems()
+        if len(selected) != 1:
+            return -1
+        return self.items.index(selected[0])
+
+    def on_selection_changed(self):
+        self.column_selected.emit(self.selected_index())
+
+    def update_column(self, index, data):
+        self.items[index].set_data(dict(data))
+        self.relayout(index)
+
+    def insert_column(self, index, data):
+        item = ColumnItem(dict(data), index+1)
+        self.scene().addItem(item)
+        self.items.insert(index, item)
+        self.relayout(index)
+        self.scene().clearSelection()
+        item.setSelected(True)
+        self.ensureVisible(item)
+
+    def remove_column(self, index):
+        item = self.items.pop(index)
+        self.scene().removeItem(item)
+        self.relayout(index)
+
+    def wheelEvent(self, event):
+        """按住Ctrl滚动滚轮缩放"""
+        if event.modifiers() & Qt.ControlModifier:
+            factor = 1.15 if event.angleDelta().y() > 0 else 1/1.15
+            self.scale(factor, factor)
+        else:
+            super().wheelEvent(event)
+
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -210,6 +357,7 @@ class MainWindow(QMainWindow):
 
         self.current_file = None
         self.columns = []
+        self.canvas_mode = False  # 是否为画布模式
 
         self.init_ui()
 
@@ -264,8 +412,41 @@ class MainWindow(QMainWindow):
         add_column_btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
         add_column_btn.setFixedHeight(30)
 
-        main_layout.addWidget(scroll_area)
-        main_layout.addWidget(add_column_btn)
+        # 控件模式页面
+        widget_page = QWidget()
+        widget_page_layout = QVBoxLayout(widget_page)
+        widget_page_layout.setContentsMargins(0, 0, 0, 0)
+        widget_page_layout.addWidget(scroll_area)
+        widget_page_layout.addWidget(add_column_btn)
+
+        # 画布模式页面：列绘制在画布上，只为选中的列显示一个编辑控件
+        canvas_page = QWidget()
+        canvas_page_layout = QHBoxLayout(canvas_page)
+        canvas_page_layout.setContentsMargins(0, 0, 0, 0)
+
+        self.canvas = LayoutCanvas()
+        self.canvas.column_selected.connect(self.on_canvas_column_selected)
+        canvas_page_layout.addWidget(self.canvas, 1)
+
+        editor_layout = QVBoxLayout()
+        self.canvas_editor = ColumnWidget(remove_callback=self.remove_canvas_column)
+        self.canvas_editor.setEnabled(False)
+        editor_layout.addWidget(self.canvas_editor, 1)
+
+        apply_btn = QPushButton("应用修改")
+        apply_btn.clicked.connect(self.apply_canvas_column)
+        editor_layout.addWidget(apply_btn)
+
+        canvas_add_btn = QPushButton("在其后添加列")
+        canvas_add_btn.clicked.connect(self.add_canvas_column)
+        editor_layout.addWidget(canvas_add_btn)
+        canvas_page_layout.addLayout(editor_layout)
+
+        self.pages = QStackedWidget()
+        self.pages.addWidget(widget_page)
+        self.pages.addWidget(canvas_page)
+
+        main_layout.addWidget(self.pages)
 
         central_widget.setLayout(main_layout)
 
@@ -295,6 +476,85 @@ class MainWindow(QMainWindow):
         save_as_action.triggered.connect(self.save_as_file)
         file_menu.addAction(save_as_action)
 
+        # 视图菜单
+        view_menu = menubar.addMenu("视图")
+
+        self.canvas_action = QAction("画布模式", self)
+        self.canvas_action.setCheckable(True)
+        self.canvas_action.toggled.connect(self.set_canvas_mode)
+        view_menu.addAction(self.canvas_action)
+
+    def set_canvas_mode(self, enabled):
+        """在控件模式和画布模式之间切换，列数据随之转移"""
+        if enabled == self.canvas_mode:
+            return
+        if enabled:
+            if not self.validate_all_columns():
+                self.canvas_action.setChecked(False)
+                return
+            self.canvas.set_columns([column.get_data() for column in self.columns])
+            self.clear_columns()
+        else:
+            self.load_columns(self.canvas.get_columns())
+            self.canvas.set_columns([])
+        self.canvas_mode = enabled
+        self.pages.setCurrentIndex(1 if enabled else 0)
+        self.canvas_action.setChecked(enabled)
+
+    def clear_columns(self):
+        """清除控件模式中的所有列"""
+        for column in self.columns:
+            column.deleteLater()
+        self.columns.clear()
+
+    def load_columns(self, columns):
+        """在控件模式中创建列"""
+        self.clear_columns()
+        for column_data in columns:
+            column = ColumnWidget(remove_callback=self.remove_column)
+            column.set_data(column_data)
+            column.setMinimumHeight(450)  # 设置最小高度
+            self.columns_layout.addWidget(column)
+            self.columns.append(column)
+
+    def current_map(self):
+        """当前模式下的全部列数据"""
+        if self.canvas_mode:
+            return self.canvas.get_columns()
+        return [column.get_data() for column in self.columns]
+
+    def on_canvas_column_selected(self, index):
+        """画布中选中列时，把数据载入唯一的编辑控件"""
+        self.canvas_editor.setEnabled(index >= 0)
+        if index >= 0:
+            self.canvas_editor.set_data(self.canvas.items[index].data)
+
+    def apply_canvas_column(self):
+        """把编辑控件中的数据写回选中的列"""
+        index = self.canvas.selected_index()
+        if index < 0:
+            return
+        if not self.canvas_editor.is_valid():
+            QMessageBox.warning(self, "输入错误", "请确保长度和起始编号都是有效的整数。")
+            return
+        self.canvas.update_column(index, self.canvas_editor.get_data())
+
+    def add_canvas_column(self):
+        """在选中列之后（未选中时在末尾）添加一列"""
+        index = self.canvas.selected_index()
+        index = len(self.canvas.items) if index < 0 else index+1
+        self.canvas.insert_column(index, DEFAULT_COLUMN)
+
+    def remove_canvas_column(self, editor=None):
+        """删除画布中选中的列"""
+        index = self.canvas.selected_index()
+        if index < 0:
+            return
+        if len(self.canvas.items) > 1:  # 至少保留一列
+            self.canvas.remove_column(index)
+        else:
+            QMessageBox.warning(self, "警告", "至少需要保留一列！")
+
     def new_file(self):
         # 确认是否保存当前文件
         if self.columns and any(self.has_column_data()):
@@ -309,13 +569,12 @@ class MainWindow(QMainWindow):
             elif reply == QMessageBox.Cancel:
                 return
 
-        # 清除所有列
-        for column in self.columns:
-            column.deleteLater()
-        self.columns.clear()
-
-        # 添加一个初始列
-        self.add_column()
+        # 清除所有列并添加一个初始列
+        if self.canvas_mode:
+            self.canvas.set_columns([DEFAULT_COLUMN])
+        else:
+            self.clear_columns()
+            self.add_column()
 
         self.current_file = None
         self.setWindowTitle("课室座位布局管理器 - 新文件")
@@ -347,6 +606,9 @@ class MainWindow(QMainWindow):
 
     def validate_all_columns(self):
         """验证所有列的数据是否有效"""
+        if self.canvas_mode:
+            # 画布模式的数据在应用修改时已验证
+            return True
         invalid_columns = []
         for i, column in enumerate(self.columns):
             if not column.is_valid():
@@ -374,18 +636,23 @@ class MainWindow(QMainWindow):
                 with open(file_path, 'r', encoding='utf-8') as file:
                     data = json.load(file)
 
-                # 清除现有列
-                for column in self.columns:
-                    column.deleteLater()
-                self.columns.clear()
+                if data.get("format") == "grid":
+                    QMessageBox.warning(self, "警告", "网格格式的布局不能在列编辑器中打开。")
+                    return
+
+                columns = data.get("map", [])
+
+                # 列数很多时直接在画布模式中打开，不创建逐列控件
+                if len(columns) > CANVAS_THRESHOLD and not self.canvas_mode:
+                    self.clear_columns()
+                    self.canvas_mode = True
+                    self.pages.setCurrentIndex(1)
+                    self.canvas_action.setChecked(True)
 
-                # 添加新列
-                for column_data in data.get("map", []):
-                    column = ColumnWidget(remove_callback=self.remove_column)
-                    column.set_data(column_data)
-                    column.setMinimumHeight(450)  # 设置最小高度
-                    self.columns_layout.addWidget(column)
-                    self.columns.append(column)
+                if self.canvas_mode:
+                    self.canvas.set_columns(columns)
+                else:
+                    self.load_columns(columns)
 
                 self.name = data.get("name", "未命名布局")
 
@@ -429,7 +696,7 @@ class MainWindow(QMainWindow):
             data = {
                 "name": "未命名布局",
                 "time": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime()),
-                "map": [column.get_data() for column in self.columns]
+                "map": self.current_map()
             }
 
             with open(file_path, 'w', encoding='utf-8') as file:
@@ -1,18 +1,423 @@
-import pandas as pd
+from __future__ import annotations
+
+import hashlib
 import json
+import math
+import os
 import random
+import threading
 import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+import timing
+
+if TYPE_CHECKING:
+    import numpy as np  # 仅用于类型标注；numpy在用到数组的函数中按需导入，避免拖慢程序启动
+
+
+def new_seed() -> int:
+    """生成一个新的随机种子"""
+    return random.SystemRandom().getrandbits(63)
+
+
+def shuffle_assign(seat_count: int, stu_count: int, rng=random) -> list:
+    """
+    分配引擎：返回长度为stu_count的座位索引列表，第i名学生坐到第i个索引对应的座位
+
+    对座位索引做一次部分Fisher-Yates置换，时间O(n)，
+    每种"学生→座位"的单射出现概率相同；rng可传入random.Random实例以复现结果
+    """
+    seats = list(range(seat_count))
+    for i in range(stu_count):
+        j = rng.randint(i, seat_count-1)
+        seats[i], seats[j] = seats[j], seats[i]
+    return seats[:stu_count]
+
+
+def batch_permutations(seat_count: int, stu_count: int, k: int, seed: int = None) -> np.ndarray:
+    """
+    批量分配引擎：返回k×seat_count的int32矩阵，每行为一次独立的随机安排
+
+    第i列为坐在第i个可用座位上的学生索引，空座位为-1
+    """
+    import numpy as np
+    # 前stu_count个为学生索引，其余为空座位
+    base = np.arange(seat_count, dtype=np.int32)
+    base[stu_count:] = -1
+    # 每行独立做一次置换
+    return np.random.default_rng(seed).permuted(np.tile(base, (k, 1)), axis=1)
+
+
+def roster_hash(stu_list: list) -> str:
+    """学生列表（含顺序）的SHA-256"""
+    data = json.dumps([stu.get_data() for stu in stu_list], ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def encode_runs(mask: np.ndarray) -> list:
+    """
+    将布尔掩码按行优先展开后游程编码
+
+    返回各段长度，第一段为不可用（mask[0, 0]可用时第一段长度为0），之后交替
+    """
+    import numpy as np
+    flat = np.asarray(mask, dtype=bool).ravel()
+    if len(flat) == 0:
+        return []
+    edges = np.flatnonzero(flat[1:] != flat[:-1]) + 1
+    runs = np.diff(np.concatenate(([0], edges, [len(flat)]))).tolist()
+    if flat[0]:
+        runs.insert(0, 0)
+    return runs
+
+
+def decode_runs(runs: list, shape: tuple) -> np.ndarray:
+    """encode_runs的逆运算，返回形状为shape的布尔掩码"""
+    import numpy as np
+    runs = np.asarray(runs, dtype=np.int64)
+    if runs.sum() != shape[0]*shape[1]:
+        raise ValueError(f"游程总长{int(runs.sum())}与网格大小{shape[0]}×{shape[1]}不符")
+    values = np.arange(len(runs)) % 2 == 1
+    return np.repeat(values, runs).reshape(shape)
+
+
+def diff_roster(old_list: list, new_list: list) -> dict:
+    """
+    按学号对比两份学生列表
+
+    返回{"added": [...], "removed": [...], "changed": [...]}，均为Student列表，
+    changed中为新的数据；任一列表中学号重复时抛出ValueError
+    """
+    old_by_id = {}
+    for stu in old_list:
+        if stu.id in old_by_id:
+            raise ValueError(f"原学生列表中学号重复: {stu.id}")
+        old_by_id[stu.id] = stu
+    new_by_id = {}
+    for stu in new_list:
+        if stu.id in new_by_id:
+            raise ValueError(f"新学生列表中学号重复: {stu.id}")
+        new_by_id[stu.id] = stu
+
+    diff = {"added": [], "removed": [], "changed": []}
+    for id, stu in old_by_id.items():
+        new = new_by_id.get(id)
+        if new is None:
+            diff["removed"].append(stu)
+        elif new.get_data() != stu.get_data():
+            diff["changed"].append(new)
+    diff["added"] = [stu for id, stu in new_by_id.items() if id not in old_by_id]
+    return diff
+
+
+class Seat_Rule():
+    """座位约束：两名学生必须相邻（together）或不得相邻（apart）"""
+
+    TOGETHER = "together"
+    APART = "apart"
+
+    def __init__(self, a, b, kind: str) -> None:
+        self.a = a  # 学生a（Student对象）
+        self.b = b  # 学生b（Student对象）
+        self.kind = kind  # 约束类型：TOGETHER或APART
+
+    def __repr__(self) -> str:
+        return f"Seat_Rule({self.a.name!r}, {self.b.name!r}, {self.kind!r})"
+
+
+class Constraint_Solver():
+    """
+    约束分配引擎：从一次随机分配出发做局部搜索（模拟退火）
+
+    相邻指同列前后或相邻列同排（中间隔过道不算相邻）
+    每步只交换两个座位，并只重算涉及这两名学生的约束
+    """
+
+    def __init__(self, avail_seats: list, stu_list: list, rules: list, rng=random) -> None:
+        self.rng = rng  # 随机数生成器
+        self.avail_seats = avail_seats
+        self.stu_count = len(stu_list)
+        self.rules = rules
+        self.seat_index = {position: i for i, position in enumerate(avail_seats)}
+
+        # 约束转为学生索引对（按学号对应），并按学生建立索引
+        index = {stu.id: i for i, stu in enumerate(stu_list)} if rules else {}
+        self.pairs = []  # (a, b, 是否要求相邻)
+        self.rules_of = [[] for _ in range(self.stu_count)]
+        for r, rule in enumerate(rules):
+            a, b = index.get(rule.a.id), index.get(rule.b.id)
+            if a is None or b is None:
+                raise ValueError(f"约束中的学生不在学生列表中: {rule!r}")
+            self.pairs.append((a, b, rule.kind == Seat_Rule.TOGETHER))
+            self.rules_of[a].append(r)
+            if b != a:
+                self.rules_of[b].append(r)
+
+    def adjacent(self, p: int, q: int) -> bool:
+        """两个可用座位是否相邻"""
+        (x1, y1), (x2, y2) = self.avail_seats[p], self.avail_seats[q]
+        return abs(x1-x2) + abs(y1-y2) == 1
+
+    def neighbours(self, p: int) -> list:
+        """可用座位p的相邻可用座位"""
+        x, y = self.avail_seats[p]
+        result = []
+        for position in ((x-1, y), (x+1, y), (x, y-1), (x, y+1)):
+            if position in self.seat_index:
+                result.append(self.seat_index[position])
+        return result
+
+    def violated(self, r: int) -> bool:
+        """约束r当前是否未满足"""
+        a, b, together = self.pairs[r]
+        return self.adjacent(self.pos[a], self.pos[b]) != together
+
+    PATIENCE = 3000  # 最优解连续这么多步没有改进时提前结束
+
+    def solve(self, max_steps: int = None, patience: int = None, time_limit: float = None) -> tuple:
+        """
+        返回(seats, unsatisfied)
+        seats[i]为第i名学生所在的可用座位索引，unsatisfied为未能满足的Seat_Rule列表
+
+        全部满足、最优解连续patience步未改进或运行超过time_limit秒时结束，
+        因此存在无法满足的约束时也不会跑满max_steps
+        """
+        n = len(self.avail_seats)
+        if max_steps is None:
+            max_steps = 2000 + 500*len(self.rules)
+        if patience is None:
+            patience = self.PATIENCE
+        deadline = None if time_limit is None else time.perf_counter() + time_limit
+
+        rng = self.rng
+        self.pos = shuffle_assign(n, self.stu_count, rng)
+        occupant = [-1]*n  # 座位上的学生索引，空为-1
+        for stu, seat in enumerate(self.pos):
+            occupant[seat] = stu
+
+        # 未满足的约束：列表用于O(1)随机抽取，字典记录每条约束在列表中的位置
+        bad = []
+        bad_index = {}
+
+        def add_bad(r):
+            if r not in bad_index:
+                bad_index[r] = len(bad)
+                bad.append(r)
+
+        def remove_bad(r):
+            i = bad_index.pop(r, None)
+            if i is None:
+                return
+            last = bad.pop()
+            if last != r:
+                bad[i] = last
+                bad_index[last] = i
+
+        for r in range(len(self.pairs)):
+            if self.violated(r):
+                add_bad(r)
+        best, best_pos = len(bad), self.pos.copy()
+        best_step = 0
+
+        temperature = 1.0
+        cooling = 0.01 ** (1/max_steps)  # 温度从1降到0.01
+        for step in range(max_steps):
+            if not bad or step - best_step > patience:
+                break
+            if deadline is not None and step % 256 == 0 and time.perf_counter() > deadline:
+                break
+            temperature *= cooling
+
+            # 选择一条未满足的约束，移动其中一名学生
+            a, b, together = self.pairs[bad[rng.randrange(len(bad))]]
+            if rng.random() < 0.5:
+                a, b = b, a
+            s1 = self.pos[b]
+            if together:
+                s2 = rng.choice(self.neighbours(self.pos[a]) or [s1])
+            else:
+                s2 = rng.randrange(n)
+            if s1 == s2:
+                continue
+
+            # 只重算涉及被交换的两名学生的约束
+            other = occupant[s2]
+            touched = set(self.rules_of[b])
+            if other >= 0:
+                touched.update(self.rules_of[other])
+            before = sum(r in bad_index for r in touched)
+
+            self._swap(occupant, s1, s2)
+            after = [r for r in touched if self.violated(r)]
+            delta = len(after) - before
+            if delta > 0 and rng.random() >= math.exp(-delta/temperature):
+                self._swap(occupant, s1, s2)  # 拒绝，撤销交换
+                continue
+
+            for r in touched:
+                remove_bad(r)
+            for r in after:
+                add_bad(r)
+            if len(bad) < best:
+                best, best_pos, best_step = len(bad), self.pos.copy(), step
+
+        self.pos = best_pos
+        unsatisfied = [self.rules[r] for r in range(len(self.pairs)) if self.violated(r)]
+        return self.pos, unsatisfied
+
+    def _swap(self, occupant: list, s1: int, s2: int) -> None:
+        """交换两个座位上的学生（其中一个可以为空座位）"""
+        a, b = occupant[s1], occupant[s2]
+        occupant[s1], occupant[s2] = b, a
+        if a >= 0:
+            self.pos[a] = s2
+        if b >= 0:
+            self.pos[b] = s1
+
+
+class History_Solver(Constraint_Solver):
+    """
+    避开历史同桌的分配引擎：从一次随机分配出发，用交换减少与历史相邻对的重复
+
+    代价为所有相邻座位对的历史相邻次数之和，每步只重算被交换的两个座位的相邻边
+    """
+
+    def __init__(self, avail_seats: list, stu_list: list, history, rng=random) -> None:
+        super().__init__(avail_seats, stu_list, [], rng)
+        self.nbrs = [self.neighbours(p) for p in range(len(avail_seats))]
+
+        # 历史相邻次数：weights[a][b]，a、b为学生索引
+        index = {stu.id: i for i, stu in enumerate(stu_list)}
+        self.weights = {}
+        for (id_a, id_b), count in history.counts.items():
+            a, b = index.get(id_a), index.get(id_b)
+            if a is None or b is None:
+                continue
+            self.weights.setdefault(a, {})[b] = count
+            self.weights.setdefault(b, {})[a] = count
+
+    def edge_cost(self, occupant: list, s1: int, s2: int) -> int:
+        """与座位s1或s2相邻的所有边的代价"""
+        cost = 0
+        for p in (s1, s2):
+            a = occupant[p]
+            if a < 0 or a not in self.weights:
+                continue
+            row = self.weights[a]
+            for q in self.nbrs[p]:
+                # s1与s2相邻时这条边只计一次
+                if p == s2 and q == s1:
+                    continue
+                cost += row.get(occupant[q], 0)
+        return cost
+
+    def solve(self, max_steps: int = None) -> tuple:
+        """
+        返回(seats, repeats)
+        seats[i]为第i名学生所在的可用座位索引，repeats为仍重复的历史相邻次数之和
+        """
+        rng = self.rng
+        n = len(self.avail_seats)
+        if max_steps is None:
+            max_steps = 50*n
+
+        self.pos = shuffle_assign(n, self.stu_count, rng)
+        occupant = [-1]*n  # 座位上的学生索引，空为-1
+        for stu, seat in enumerate(self.pos):
+            occupant[seat] = stu
+
+        hot = list(self.weights)  # 有历史相邻记录的学生
+        if hot:
+            for _ in range(max_steps):
+                s1 = self.pos[rng.choice(hot)]
+                s2 = rng.randrange(n)
+                if s1 == s2:
+                    continue
+                before = self.edge_cost(occupant, s1, s2)
+                if before == 0:
+                    continue
+                self._swap(occupant, s1, s2)
+                delta = self.edge_cost(occupant, s1, s2) - before
+                # 只接受不变差的交换，代价不变时以一半概率接受以保持随机性
+                if delta > 0 or (delta == 0 and rng.random() < 0.5):
+                    self._swap(occupant, s1, s2)
+
+        repeats = 0
+        for p in range(n):
+            row = self.weights.get(occupant[p])
+            if row:
+                repeats += sum(row.get(occupant[q], 0) for q in self.nbrs[p] if q > p)
+        return self.pos, repeats
 
 
 class Layout_Connector():
-    """布局连接器，用于读取和处理座位布局JSON文件"""
+    """
+    布局连接器，用于读取和处理座位布局JSON文件
+
+    支持两种格式：
+    列格式：{"map": [{"type", "start", "length", "text"}, ...]}，每列为起始偏移+长度
+    网格格式：{"format": "grid", "columns", "rows", "ways", "runs"}，
+    runs为逐格可用状态（按列展开）的游程编码，见encode_runs
+    """
 
+    @timing.timed("Layout_Connector")
     def __init__(self, path) -> None:
         with open(path, "r", encoding='utf-8') as j:
             data = json.load(j)
 
         self.create_time = data['time']  # 布局创建时间
-        self.map = data['map']  # 座位布局数据
+        self.mask = None  # 网格格式的可用座位掩码mask[x, y]，列格式为None
+        self.ways = None  # 网格格式的过道列索引
+        if data.get('format') == "grid":
+            import numpy as np
+            self.ways = np.array(data['ways'], dtype=np.int64)
+            self.mask = decode_runs(data['runs'], (data['columns'], data['rows']))
+            self.mask[self.ways] = False
+            # 供Classs逐列创建座位，avail为该列的掩码
+            way_set = set(self.ways.tolist())
+            self.map = [{"type": "way" if x in way_set else "seats", "avail": self.mask[x]}
+                        for x in range(self.mask.shape[0])]
+        else:
+            self.map = data['map']  # 座位布局数据
+
+    @staticmethod
+    def grid_data(mask: np.ndarray, ways: list, name: str, create_time: str) -> dict:
+        """生成网格格式的布局JSON数据"""
+        import numpy as np
+        mask = np.array(mask, dtype=bool)
+        mask[list(ways)] = False
+        return {
+            "name": name,
+            "time": create_time,
+            "format": "grid",
+            "columns": mask.shape[0],
+            "rows": mask.shape[1],
+            "ways": sorted(int(x) for x in ways),
+            "runs": encode_runs(mask)
+        }
+
+    def get_mask(self) -> tuple:
+        """
+        返回(可用座位掩码, 过道列索引)
+
+        列格式下由start和length计算，过道列仍占有start+length个格子
+        """
+        import numpy as np
+        if self.mask is not None:
+            return self.mask, self.ways
+
+        columns = self.get_map()
+        starts = np.array([data["start"] for data in columns], dtype=np.int32)
+        ends = starts + np.array([data["length"] for data in columns], dtype=np.int32)
+        is_seats = np.array([data["type"] == "seats" for data in columns], dtype=bool)
+        rows = int(ends.max()) if len(columns) else 0
+
+        # 可用座位：位于[start, start+length)且属于座位列
+        y = np.arange(rows, dtype=np.int32)
+        mask = (y >= starts[:, None]) & (y < ends[:, None]) & is_seats[:, None]
+        return mask, np.flatnonzero(~is_seats)
 
     def get_map(self) -> list:
         """获取完整的座位布局"""
@@ -22,6 +427,19 @@ class Layout_Connector():
         """获取指定行的布局数据"""
         return self.get_map()[index]
 
+    def get_hash(self) -> str:
+        """座位布局的SHA-256（与创建时间无关）"""
+        layout = self.map
+        if self.mask is not None:
+            layout = {
+                "format": "grid",
+                "shape": list(self.mask.shape),
+                "ways": self.ways.tolist(),
+                "runs": encode_runs(self.mask)
+            }
+        data = json.dumps(layout, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
 
 class Student():
     """学生类，存储学生基本信息"""
@@ -67,6 +485,13 @@ class Column():
     def __init__(self, data: dict) -> None:
         self.column = []
         self.type = data["type"]  # 行类型："seats"或"way"
+
+        # 网格格式：逐格给出可用状态
+        if "avail" in data:
+            for booll in data["avail"].tolist():
+                self.column.append(Seat(booll))
+            return
+
         length = data["length"] + data["start"]
 
         # 初始化行中的每个位置
@@ -100,10 +525,103 @@ class Column():
         return self.type
 
 
+class Seating_Result():
+    """
+    随机结果：座位坐标为整数，学生为stu_list中的索引
+
+    遍历时依次得到(x, y, Student)，无需格式化或解析字符串
+    """
+
+    def __init__(self, stu_list: list, xs: list, ys: list, stu_index: list, seed: int = None) -> None:
+        self.stu_list = stu_list  # 学生列表
+        self.xs = xs  # 列坐标
+        self.ys = ys  # 行坐标
+        self.stu_index = stu_index  # 学生在stu_list中的索引
+        self.seed = seed  # 生成该结果的种子（random方式），未知时为None
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def __iter__(self):
+        stu_list = self.stu_list
+        for x, y, index in zip(self.xs, self.ys, self.stu_index):
+            yield x, y, stu_list[index]
+
+    def dump(self) -> dict:
+        """转为可直接json序列化的字典"""
+        return {
+            "stu_list": [stu.get_data() for stu in self.stu_list],
+            "x": self.xs,
+            "y": self.ys,
+            "stu": self.stu_index,
+            "seed": self.seed
+        }
+
+    @staticmethod
+    def load(data: dict):
+        """从dump的输出恢复"""
+        stu_list = [Student(i['name'], i['id'], i['sex']) for i in data['stu_list']]
+        return Seating_Result(stu_list, data['x'], data['y'], data['stu'], data.get('seed'))
+
+
+class Pair_History():
+    """
+    历史相邻对索引：记录最近keep次安排中每对学生（按学号）相邻的次数
+
+    加入新安排时只增减该次安排涉及的相邻对，无需重新扫描全部历史
+    """
+
+    def __init__(self, keep: int = 30) -> None:
+        self.keep = keep  # 保留的历史安排数量
+        self.arrangements = deque()  # 每次安排的相邻对列表
+        self.counts = {}  # (学号a, 学号b) -> 相邻次数，学号a < 学号b
+
+    @staticmethod
+    def pairs_of(result: Seating_Result) -> list:
+        """一次安排中所有相邻的学生对（同列前后或相邻列同排）"""
+        seat_of = {(x, y): stu.id for x, y, stu in result}
+        pairs = []
+        for (x, y), id_a in seat_of.items():
+            for position in ((x+1, y), (x, y+1)):
+                id_b = seat_of.get(position)
+                if id_b is not None:
+                    pairs.append((id_a, id_b) if id_a < id_b else (id_b, id_a))
+        return pairs
+
+    def add(self, result: Seating_Result) -> None:
+        """记录一次安排，超过keep次时移除最早的一次"""
+        self._push(self.pairs_of(result))
+
+    def _push(self, pairs: list) -> None:
+        self.arrangements.append(pairs)
+        for pair in pairs:
+            self.counts[pair] = self.counts.get(pair, 0) + 1
+        while len(self.arrangements) > self.keep:
+            for pair in self.arrangements.popleft():
+                if self.counts[pair] == 1:
+                    del self.counts[pair]
+                else:
+                    self.counts[pair] -= 1
+
+    def dump(self) -> dict:
+        """转为可直接json序列化的字典"""
+        return {"keep": self.keep, "arrangements": [[list(pair) for pair in pairs] for pairs in self.arrangements]}
+
+    @staticmethod
+    def load(data: dict):
+        """从dump的输出恢复"""
+        history = Pair_History(data["keep"])
+        for pairs in data["arrangements"]:
+            history._push([tuple(pair) for pair in pairs])
+        return history
+
+
 class Classs():
     """班级类，管理整个班级的座位布局和学生分配"""
 
+    @timing.timed("Classs")
     def __init__(self, layout: Layout_Connector) -> None:
+        import numpy as np
         self.map = []
         # 根据布局数据创建行
         for data in layout.get_map():
@@ -111,19 +629,18 @@ class Classs():
         
         self.have_random = False  # 标记是否已完成随机分配
         self.have_random_seats = []  # 已分配座位的坐标列表
+        self.seed = None  # 最近一次随机使用的种子
+        self.mode = None  # 最近一次分配的方式："random"、"constrained"、"avoid_history"或"arrangement"
 
-        # 列举所有可用座位坐标
-        self.avail_seats = []
-        for x in range(len(self.map)):
-            column: Column = self.map[x]
-            if column.get_type() == "seats":
-                for y in column.get_all_avail_seats_index():
-                    self.avail_seats.append((x, y))
+        # 列举所有可用座位坐标（按列、再按行排列）
+        mask, _ = layout.get_mask()
+        self.avail_seats = [tuple(i) for i in np.argwhere(mask).tolist()]
 
     def get_all_avail_seats(self) -> list:
         """获取所有可用座位坐标"""
         return self.avail_seats
 
+    @timing.timed("Classs.check")
     def check(self, stu_list: list):
         """
         检查布局和学生列表的合法性
@@ -143,26 +660,108 @@ class Classs():
             return -3
         return False
 
-    def random(self, stu_list: list):
-        """随机分配学生到座位"""
+    @timing.timed("Classs.random")
+    def random(self, stu_list: list, seed: int = None):
+        """
+        随机分配学生到座位
+
+        seed为随机种子，为None时自动生成，实际使用的种子记录在self.seed中
+        相同的学生列表、布局和种子总会得到相同的结果
+        """
         if self.check(stu_list) != False:
             return
 
-        avail_seats = self.avail_seats.copy()
-        stu_list_copy = stu_list.copy()
+        self.seed = new_seed() if seed is None else seed
+        self.mode = "random"
+        rng = random.Random(self.seed)
+        self.have_random_seats = []
+        # 单次置换：第i名学生坐到第i个抽中的座位
+        for stu, index in zip(stu_list, shuffle_assign(len(self.avail_seats), len(stu_list), rng)):
+            position = self.avail_seats[index]
+            self.have_random_seats.append(position)
+            # 将学生分配到座位
+            x, y = position[0], position[1]
+            self.map[x].dump(y, stu)
+
+        self.have_random = True
 
-        while stu_list_copy and avail_seats:
-            # 随机选择学生和座位
-            stu = stu_list_copy.pop(random.randint(0, len(stu_list_copy)-1))
-            position = avail_seats.pop(random.randint(0, len(avail_seats)-1))
+    def random_constrained(self, stu_list: list, rules: list, max_steps: int = None, seed: int = None):
+        """
+        在满足座位约束（Seat_Rule列表）的前提下随机分配学生到座位
 
+        返回未能满足的约束列表（全部满足时为空列表），检查不通过时返回None
+        seed的含义同random
+        """
+        if self.check(stu_list) != False:
+            return None
+
+        self.seed = new_seed() if seed is None else seed
+        self.mode = "constrained"
+        solver = Constraint_Solver(self.avail_seats, stu_list, rules, random.Random(self.seed))
+        seats, unsatisfied = solver.solve(max_steps)
+        self.have_random_seats = []
+        for stu, index in zip(stu_list, seats):
+            position = self.avail_seats[index]
             self.have_random_seats.append(position)
-            # 将学生分配到座位
             x, y = position[0], position[1]
             self.map[x].dump(y, stu)
 
         self.have_random = True
+        return unsatisfied
 
+    def random_avoid_history(self, stu_list: list, history: Pair_History, max_steps: int = None, seed: int = None):
+        """
+        随机分配学生到座位，并尽量避免与历史安排中的相邻对再次相邻
+
+        返回仍重复的历史相邻次数之和，检查不通过时返回None
+        seed的含义同random
+        """
+        if self.check(stu_list) != False:
+            return None
+
+        self.seed = new_seed() if seed is None else seed
+        self.mode = "avoid_history"
+        solver = History_Solver(self.avail_seats, stu_list, history, random.Random(self.seed))
+        seats, repeats = solver.solve(max_steps)
+        self.have_random_seats = []
+        for stu, index in zip(stu_list, seats):
+            position = self.avail_seats[index]
+            self.have_random_seats.append(position)
+            x, y = position[0], position[1]
+            self.map[x].dump(y, stu)
+
+        self.have_random = True
+        return repeats
+
+    def random_batch(self, stu_list: list, k: int, seed: int = None) -> np.ndarray:
+        """
+        一次生成k种互相独立的随机安排，不修改本班级
+
+        返回k×n的int32矩阵（n为可用座位数），第r行第i列为
+        坐在avail_seats[i]上的学生在stu_list中的索引，空座位为-1
+        检查不通过时返回None
+        """
+        if self.check(stu_list) != False:
+            return None
+
+        return batch_permutations(len(self.avail_seats), len(stu_list), k, seed)
+
+    def apply_arrangement(self, stu_list: list, arrangement) -> None:
+        """将random_batch输出的某一行写入座位，之后可照常调用get_processed_data"""
+        self.seed = None  # 单行安排无法由种子复现
+        self.mode = "arrangement"
+        self.have_random_seats = []
+        for index, stu_index in enumerate(arrangement):
+            if stu_index < 0:
+                continue
+            position = self.avail_seats[index]
+            self.have_random_seats.append(position)
+            x, y = position[0], position[1]
+            self.map[x].dump(y, stu_list[stu_index])
+
+        self.have_random = True
+
+    @timing.timed("Classs.get_processed_data")
     def get_processed_data(self) -> dict:
         """获取随机后数据（仅包含被分配的座位）"""
         result = {}
@@ -171,6 +770,14 @@ class Classs():
             seat: Seat = self.map[x].get_seat(y)
             result[str(position)] = seat.get_stu().get_data()
         return result
+
+    def get_result(self) -> Seating_Result:
+        """获取随机后数据的结构化形式（仅包含被分配的座位）"""
+        xs = [position[0] for position in self.have_random_seats]
+        ys = [position[1] for position in self.have_random_seats]
+        stu_list = [self.map[x].get_seat(y).get_stu() for x, y in zip(xs, ys)]
+        seed = self.seed if self.mode == "random" else None
+        return Seating_Result(stu_list, xs, ys, list(range(len(stu_list))), seed)
     
     def display_unit(self) -> tuple:
         """输出显示所需的列、行数量"""
@@ -194,21 +801,431 @@ class Classs():
 
 
 
+class Compiled_Layout():
+    """
+    编译后的布局：可用座位掩码、座位坐标、过道列和显示尺寸
+
+    只含numpy数组和整数，可直接存为二进制文件，供Compact_Classs反复使用
+    """
+
+    def __init__(self, mask: np.ndarray, seat_xy: np.ndarray, ways: np.ndarray, layout_hash: str) -> None:
+        self.mask = mask  # 可用座位掩码，mask[x, y]
+        self.seat_xy = seat_xy  # 可用座位坐标，顺序与Classs.avail_seats相同
+        self.ways = ways  # 过道列索引
+        self.layout_hash = layout_hash  # 同Layout_Connector.get_hash
+
+    @staticmethod
+    def compile(layout: Layout_Connector):
+        """由布局计算各项数据"""
+        import numpy as np
+        mask, ways = layout.get_mask()
+        seat_xy = np.argwhere(mask).astype(np.int32)
+        return Compiled_Layout(mask, seat_xy, ways, layout.get_hash())
+
+    def display_unit(self) -> tuple:
+        """输出显示所需的列、行数量"""
+        return (self.mask.shape[0], self.mask.shape[1]+1)
+
+    def save(self, path) -> None:
+        """存为.npz文件"""
+        import numpy as np
+        with open(path, 'wb') as f:
+            np.savez(f, mask=self.mask, seat_xy=self.seat_xy, ways=self.ways,
+                     layout_hash=np.array(self.layout_hash))
+
+    @staticmethod
+    def load(path):
+        """从.npz文件读取"""
+        import numpy as np
+        with np.load(path) as data:
+            return Compiled_Layout(data["mask"], data["seat_xy"], data["ways"], str(data["layout_hash"]))
+
+
+class Compact_Classs():
+    """
+    紧凑班级类，接口与Classs相同，但不创建Column/Seat对象
+
+    mask[x, y]为座位是否可用，grid[x, y]为该座位学生在stu_list中的索引（空为-1）
+    layout可以是Layout_Connector，也可以是已编译的Compiled_Layout
+    """
+
+    @timing.timed("Compact_Classs")
+    def __init__(self, layout) -> None:
+        import numpy as np
+        if not isinstance(layout, Compiled_Layout):
+            layout = Compiled_Layout.compile(layout)
+        self.compiled = layout
+
+        # 以下数组与Compiled_Layout共享，只读
+        self.ways = layout.ways  # 过道列索引
+        self.rows = layout.mask.shape[1]
+        self.mask = layout.mask
+        self.seat_xy = layout.seat_xy
+
+        self.grid = np.full(self.mask.shape, -1, dtype=np.int32)
+
+        self.stu_list = []
+        self.have_random = False  # 标记是否已完成随机分配
+        self.seed = None  # 最近一次随机使用的种子
+        self.mode = None  # 最近一次分配的方式，同Classs.mode
+
+    @property
+    def have_random_seats(self) -> list:
+        """已分配座位的坐标列表"""
+        import numpy as np
+        return [tuple(i) for i in np.argwhere(self.grid >= 0).tolist()]
+
+    def get_all_avail_seats(self) -> list:
+        """获取所有可用座位坐标"""
+        return [tuple(i) for i in self.seat_xy.tolist()]
+
+    @timing.timed("Compact_Classs.check")
+    def check(self, stu_list: list):
+        """
+        检查布局和学生列表的合法性
+
+        Error Code:
+        -1: 空布局
+        -2: 空学生列表
+        -3: 座位不足
+        """
+        l1 = len(self.seat_xy)
+        if l1 == 0:
+            return -1
+        l2 = len(stu_list)
+        if l2 == 0:
+            return -2
+        if l1 < l2:
+            return -3
+        return False
+
+    @timing.timed("Compact_Classs.random")
+    def random(self, stu_list: list, seed: int = None):
+        """随机分配学生到座位，同一种子下与Classs.random结果相同"""
+        import numpy as np
+        if self.check(stu_list) != False:
+            return
+
+        self.seed = new_seed() if seed is None else seed
+        self.mode = "random"
+        seats = shuffle_assign(len(self.seat_xy), len(stu_list), random.Random(self.seed))
+        self._place(stu_list, np.array(seats, dtype=np.int64), np.arange(len(stu_list), dtype=np.int32))
+
+    def random_constrained(self, stu_list: list, rules: list, max_steps: int = None, seed: int = None):
+        """在满足座位约束的前提下随机分配，返回值同Classs.random_constrained"""
+        import numpy as np
+        if self.check(stu_list) != False:
+            return None
+
+        self.seed = new_seed() if seed is None else seed
+        self.mode = "constrained"
+        solver = Constraint_Solver(self.get_all_avail_seats(), stu_list, rules, random.Random(self.seed))
+        seats, unsatisfied = solver.solve(max_steps)
+        self._place(stu_list, np.array(seats, dtype=np.int64), np.arange(len(stu_list), dtype=np.int32))
+        return unsatisfied
+
+    def random_avoid_history(self, stu_list: list, history: Pair_History, max_steps: int = None, seed: int = None):
+        """避开历史相邻对的随机分配，返回值同Classs.random_avoid_history"""
+        import numpy as np
+        if self.check(stu_list) != False:
+            return None
+
+        self.seed = new_seed() if seed is None else seed
+        self.mode = "avoid_history"
+        solver = History_Solver(self.get_all_avail_seats(), stu_list, history, random.Random(self.seed))
+        seats, repeats = solver.solve(max_steps)
+        self._place(stu_list, np.array(seats, dtype=np.int64), np.arange(len(stu_list), dtype=np.int32))
+        return repeats
+
+    def random_batch(self, stu_list: list, k: int, seed: int = None) -> np.ndarray:
+        """一次生成k种互相独立的随机安排，格式同Classs.random_batch"""
+        if self.check(stu_list) != False:
+            return None
+
+        return batch_permutations(len(self.seat_xy), len(stu_list), k, seed)
+
+    def apply_arrangement(self, stu_list: list, arrangement) -> None:
+        """将random_batch输出的某一行写入座位"""
+        import numpy as np
+        self.seed = None
+        self.mode = "arrangement"
+        arrangement = np.asarray(arrangement)
+        seats = np.flatnonzero(arrangement >= 0)
+        self._place(stu_list, seats, arrangement[seats])
+
+    def _place(self, stu_list: list, seats, stu_index) -> None:
+        """第i名学生（stu_index[i]）坐到第seats[i]个可用座位"""
+        self.stu_list = stu_list
+        self.grid.fill(-1)
+        xy = self.seat_xy[seats]
+        self.grid[xy[:, 0], xy[:, 1]] = stu_index
+        self.have_random = True
+
+    @timing.timed("Compact_Classs.get_processed_data")
+    def get_processed_data(self) -> dict:
+        """获取随机后数据（仅包含被分配的座位）"""
+        import numpy as np
+        result = {}
+        xs, ys = np.nonzero(self.grid >= 0)
+        for x, y, index in zip(xs.tolist(), ys.tolist(), self.grid[xs, ys].tolist()):
+            result[str((x, y))] = self.stu_list[index].get_data()
+        return result
+
+    def get_result(self) -> Seating_Result:
+        """获取随机后数据的结构化形式（仅包含被分配的座位）"""
+        import numpy as np
+        xs, ys = np.nonzero(self.grid >= 0)
+        seed = self.seed if self.mode == "random" else None
+        return Seating_Result(self.stu_list, xs.tolist(), ys.tolist(), self.grid[xs, ys].tolist(), seed)
+
+    def display_unit(self) -> tuple:
+        """输出显示所需的列、行数量"""
+        return (self.mask.shape[0], self.rows+1)
+
+    def way_gather(self) -> list:
+        """输出需要合并的列"""
+        return self.ways.tolist()
+
+
+def _fill_room(layout: Layout_Connector, stu_list: list, seed: int) -> Seating_Result:
+    """进程池任务：用给定种子随机填充单个考场"""
+    if not stu_list:
+        return Seating_Result([], [], [], [], seed)
+    classs = Compact_Classs(layout)
+    classs.random(stu_list, seed)
+    return classs.get_result()
+
+
+def distribute_rooms(stu_list: list, layouts: list, processes: int = None, seed: int = None):
+    """
+    将一份学生名单随机分到多个考场，并在进程池中同时填充各考场
+
+    各考场分到的人数与其座位数成比例且不超过座位数
+    成功时返回与layouts一一对应的Seating_Result列表
+    失败时返回错误代码，含义同Classs.check
+
+    seed为None时自动生成；相同的名单、布局和seed总会得到相同的分配
+    每个考场的种子由seed派生并记录在对应结果的seed中，
+    Replay_Record.create(layout, result.stu_list, result.seed)可单独复现该考场
+    """
+    capacities = [len(Compact_Classs(layout).seat_xy) for layout in layouts]
+    total = sum(capacities)
+    if total == 0:
+        return -1
+    if len(stu_list) == 0:
+        return -2
+    if total < len(stu_list):
+        return -3
+
+    # 按座位数比例分配人数（最大余数法）
+    quotas = [len(stu_list)*c//total for c in capacities]
+    remainders = sorted(range(len(layouts)),
+                        key=lambda i: len(stu_list)*capacities[i] % total, reverse=True)
+    for i in remainders[:len(stu_list)-sum(quotas)]:
+        quotas[i] += 1
+
+    # 先整体打乱，再按人数切分；各考场的种子由同一随机数生成器派生
+    rng = random.Random(new_seed() if seed is None else seed)
+    shuffled = [stu_list[i] for i in shuffle_assign(len(stu_list), len(stu_list), rng)]
+    seeds = [rng.getrandbits(63) for _ in layouts]
+    parts = []
+    start = 0
+    for quota in quotas:
+        parts.append(shuffled[start:start+quota])
+        start += quota
+
+    if processes == 1:
+        return [_fill_room(layout, part, room_seed) for layout, part, room_seed in zip(layouts, parts, seeds)]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(_fill_room, layouts, parts, seeds))
+
+
+class Replay_Record():
+    """
+    复现记录：学生列表哈希、布局哈希、种子和分配方式
+
+    只需保存这几项即可在O(n)内重新生成同一张座位表，无需保存完整结果
+    只有random方式生成的座位表可以复现，其他方式还依赖约束或历史记录
+    """
+
+    def __init__(self, roster: str, layout: str, seed: int, mode: str = "random") -> None:
+        self.roster = roster  # 学生列表哈希
+        self.layout = layout  # 布局哈希
+        self.seed = seed  # 随机种子
+        self.mode = mode  # 分配方式，同Classs.mode
+
+    @staticmethod
+    def create(layout: Layout_Connector, stu_list: list, seed: int, mode: str = "random"):
+        """为一次随机生成记录"""
+        return Replay_Record(roster_hash(stu_list), layout.get_hash(), seed, mode)
+
+    def dump(self) -> dict:
+        """转为可直接json序列化的字典"""
+        return {"roster": self.roster, "layout": self.layout, "seed": self.seed, "mode": self.mode}
+
+    @staticmethod
+    def load(data: dict):
+        """从dump的输出恢复（旧记录没有mode，均为random）"""
+        return Replay_Record(data["roster"], data["layout"], data["seed"], data.get("mode", "random"))
+
+    def replay(self, layout: Layout_Connector, stu_list: list) -> Classs:
+        """
+        重新生成记录对应的座位表
+
+        学生列表或布局与记录不一致、或记录不是random方式生成时抛出ValueError
+        """
+        if self.mode != "random" or self.seed is None:
+            raise ValueError(f"{self.mode}方式生成的座位表不能按种子复现")
+        if roster_hash(stu_list) != self.roster:
+            raise ValueError("学生列表与记录不一致")
+        if layout.get_hash() != self.layout:
+            raise ValueError("布局与记录不一致")
+        classs = Classs(layout)
+        classs.random(stu_list, self.seed)
+        return classs
+
+
+class Roster_Store():
+    """
+    列式二进制学生列表（.roster），可内存映射
+
+    文件结构：8字节标识、8字节头部长度、JSON头部，之后按8字节对齐依次为
+    性别(uint8)、姓名偏移(int64, count+1)、姓名(UTF-8)、学号偏移(int64, count+1)、学号(UTF-8)
+    打开时不解析任何学生，按索引访问时才创建Student，可直接作为stu_list使用
+    """
+    MAGIC = b"ESROSTER"
+
+    def __init__(self, path) -> None:
+        import numpy as np
+        self.path = path
+        self.buffer = np.memmap(path, dtype=np.uint8, mode='r')
+        if bytes(self.buffer[:8]) != self.MAGIC:
+            raise ValueError(f"不是有效的学生列表文件: {path}")
+        head_length = int(self.buffer[8:16].view(np.uint64)[0])
+        head = json.loads(bytes(self.buffer[16:16+head_length]).decode('utf-8'))
+        self.name = head['name']
+        self.time = head['time']
+        self.count = head['count']
+
+        # 各数组均为文件的只读视图，不复制
+        arrays = {}
+        for key, (dtype, offset, length) in head['arrays'].items():
+            arrays[key] = self.buffer[offset:offset+length*np.dtype(dtype).itemsize].view(dtype)
+        self.sexes = arrays['sex']  # 性别，1为男
+        self.name_offsets = arrays['name_offsets']
+        self.name_bytes = arrays['names']
+        self.id_offsets = arrays['id_offsets']
+        self.id_bytes = arrays['ids']
+
+    @staticmethod
+    def read_head(path) -> dict:
+        """只读取头部（name、time、count等），不映射文件，也不需要numpy"""
+        with open(path, 'rb') as f:
+            if f.read(8) != Roster_Store.MAGIC:
+                raise ValueError(f"不是有效的学生列表文件: {path}")
+            head_length = int.from_bytes(f.read(8), 'little')
+            return json.loads(f.read(head_length).decode('utf-8'))
+
+    @staticmethod
+    def _pack(texts: list) -> tuple:
+        """将字符串列表拼接为(偏移数组, UTF-8字节)"""
+        import numpy as np
+        encoded = [text.encode('utf-8') for text in texts]
+        offsets = np.zeros(len(encoded)+1, dtype=np.int64)
+        np.cumsum([len(item) for item in encoded], out=offsets[1:])
+        return offsets, np.frombuffer(b''.join(encoded), dtype=np.uint8)
+
+    @staticmethod
+    def write(path, stu_list: list, name: str, create_time: str) -> None:
+        """将学生列表写为.roster文件"""
+        import numpy as np
+        name_offsets, names = Roster_Store._pack([str(stu.name) for stu in stu_list])
+        id_offsets, ids = Roster_Store._pack([str(stu.id) for stu in stu_list])
+        parts = [
+            ('sex', np.array([bool(stu.sex) for stu in stu_list], dtype=np.uint8)),
+            ('name_offsets', name_offsets),
+            ('names', names),
+            ('id_offsets', id_offsets),
+            ('ids', ids)
+        ]
+
+        # 头部记录各数组位置，先按头部长度的上限计算偏移
+        def layout(start: int) -> dict:
+            arrays = {}
+            offset = start
+            for key, array in parts:
+                offset = (offset + 7) // 8 * 8
+                arrays[key] = (array.dtype.str, offset, len(array))
+                offset += array.nbytes
+            return arrays
+
+        head = {"name": name, "time": create_time, "count": len(stu_list), "arrays": layout(0)}
+        head_length = len(json.dumps(head, ensure_ascii=False).encode('utf-8')) + 256
+        head["arrays"] = layout(16 + head_length)
+        head_bytes = json.dumps(head, ensure_ascii=False).encode('utf-8').ljust(head_length)
+
+        with open(path, 'wb') as f:
+            f.write(Roster_Store.MAGIC)
+            f.write(np.uint64(head_length).tobytes())
+            f.write(head_bytes)
+            for key, array in parts:
+                _, offset, _ = head["arrays"][key]
+                f.write(b'\0' * (offset - f.tell()))
+                f.write(array.tobytes())
+
+    def close(self) -> None:
+        """释放内存映射（之后不能再访问学生）"""
+        mmap = getattr(self.buffer, '_mmap', None)
+        self.buffer = self.sexes = self.name_offsets = self.name_bytes = None
+        self.id_offsets = self.id_bytes = None
+        if mmap is not None:
+            mmap.close()
+
+    def name_of(self, index: int) -> str:
+        start, end = self.name_offsets[index:index+2].tolist()
+        return bytes(self.name_bytes[start:end]).decode('utf-8')
+
+    def id_of(self, index: int) -> str:
+        start, end = self.id_offsets[index:index+2].tolist()
+        return bytes(self.id_bytes[start:end]).decode('utf-8')
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> Student:
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return Student(self.name_of(index), self.id_of(index), bool(self.sexes[index]))
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+
 class Student_Operate():
     def __init__(self) -> None:
         self.stu_list = []
         self.time = ''
         self.name = ''
 
+    @timing.timed("read_from_xlsx")
     def read_from_xlsx(self, path):
-        xlsx = pd.read_excel(path, header=0, usecols=[0, 1, 2], skiprows=[0]) # 只读取前三列，跳过表头和示例
-        for row in xlsx.itertuples(index=True, name=None):
+        import pandas as pd  # 仅在导入Excel时加载，避免拖慢程序启动
+        # 只读取前三列，跳过表头和示例；学号按文本读取，避免有空单元格时变为"1001.0"
+        xlsx = pd.read_excel(path, header=0, usecols=[0, 1, 2], skiprows=[0], dtype={1: str})
+        for row in xlsx.itertuples(index=False, name=None):  # (姓名, 学号, 性别)
+            id = row[1].strip() if isinstance(row[1], str) else ""
+            if not id:
+                continue  # 学号为空的行不是学生
             if row[2] == "男":
                 sex = True
             else:
                 sex = False
-            self.stu_list.append(Student(str(row[0]), str(row[1]), sex))
+            self.stu_list.append(Student(str(row[0]), id, sex))
 
+    @timing.timed("read_from_json")
     def read_from_json(self, path):
         with open(path, 'r', encoding='utf-8') as j:
             data = json.load(j)
@@ -218,8 +1235,72 @@ class Student_Operate():
         for i in temp:
             self.stu_list.append(Student(i['name'], i['id'], i['sex']))
 
+    @timing.timed("read_from_store")
+    def read_from_store(self, path):
+        """读取.roster文件，学生在访问时才创建"""
+        store = Roster_Store(path)
+        self.name = store.name
+        self.time = store.time
+        self.stu_list = store
+
+    def read(self, path):
+        """按扩展名读取学生列表（.xlsx、.roster或.json）"""
+        ext = os.path.splitext(path)[1].lower()
+        if ext == ".xlsx":
+            self.read_from_xlsx(path)
+        elif ext == ".roster":
+            self.read_from_store(path)
+        else:
+            self.read_from_json(path)
+
     def get_stu_list(self):
         return self.stu_list
+
+    def update_stored(self, path) -> dict:
+        """
+        用当前学生列表（通常刚从Excel读取）更新已存储的文件path，返回diff_roster的结果
+
+        按学号对比，原有学生保持原来的顺序，修改的学生就地替换，新增的学生追加在末尾；
+        写回原文件（保留名称），不生成新文件；没有变化时不写入
+        """
+        old = Student_Operate()
+        old.read(path)
+        old_list = list(old.get_stu_list())
+        if isinstance(old.stu_list, Roster_Store):
+            old.stu_list.close()  # 写回前释放内存映射
+
+        diff = diff_roster(old_list, self.stu_list)
+        new_by_id = {stu.id: stu for stu in self.stu_list}
+        merged = [new_by_id[stu.id] for stu in old_list if stu.id in new_by_id]
+        merged.extend(diff["added"])
+        self.stu_list = merged
+        self.name = old.name
+        if not (diff["added"] or diff["removed"] or diff["changed"]):
+            self.time = old.time
+            return diff
+
+        # 先写临时文件再替换，避免写入中断损坏原文件
+        self.time = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
+        temp_path = f"{path}.tmp"
+        if path.lower().endswith(".roster"):
+            Roster_Store.write(temp_path, merged, self.name, self.time)
+        else:
+            result = {
+                'name': self.name,
+                'time': self.time,
+                'stu_list': [stu.get_data() for stu in merged]
+            }
+            with open(temp_path, 'w', encoding='utf-8') as j:
+                json.dump(result, j)
+        os.replace(temp_path, path)
+        return diff
+
+    def save_to_store(self, name, folder) -> str:
+        """保存为.roster文件，返回文件名"""
+        file_name = time.strftime("%Y%m%d_%H%M%S", time.localtime())
+        Roster_Store.write(f'{folder}\\{file_name}.roster', self.stu_list, name,
+                           time.strftime("%Y-%m-%d %H:%M:%S", time.localtime()))
+        return f"{file_name}.roster"
     
     def save_to_json(self, name, folder) -> str:
         file_name = time.strftime("%Y%m%d_%H%M%S", time.localtime())
@@ -234,4 +1315,274 @@ class Student_Operate():
         }
         with open(f'{folder}\\{file_name}.json', 'w', encoding='utf-8') as j:
             json.dump(result, j)
-        return f"{file_name}.json"
\ No newline at end of file
+        return f"{file_name}.json"
+
+
+class Roster_Cache():
+    """
+    名单导入缓存：以Excel文件内容的哈希为键，记录已导入的学生列表文件
+
+    同一份表格再次导入时直接返回已存储的文件，超过max_entries时淘汰最久未使用的记录
+    """
+
+    def __init__(self, path, max_entries: int = 64) -> None:
+        self.path = path  # 索引文件路径
+        self.max_entries = max_entries
+        self.index = {}  # 哈希 -> {"file": 学生列表文件路径, "used": 最近使用时间}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as j:
+                self.index = json.load(j)
+
+    @staticmethod
+    def file_hash(path) -> str:
+        """计算文件内容的SHA-256"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def lookup(self, digest: str):
+        """返回该哈希对应的已存储学生列表文件，不存在时返回None"""
+        entry = self.index.get(digest)
+        if entry is None:
+            return None
+        if not os.path.exists(entry["file"]):
+            # 存储的文件已被删除
+            del self.index[digest]
+            self.save()
+            return None
+        entry["used"] = time.time()
+        self.save()
+        return entry["file"]
+
+    def add(self, digest: str, file) -> None:
+        """记录一次新的导入"""
+        self.index[digest] = {"file": file, "used": time.time()}
+        # 淘汰最久未使用的记录
+        while len(self.index) > self.max_entries:
+            oldest = min(self.index, key=lambda k: self.index[k]["used"])
+            del self.index[oldest]
+        self.save()
+
+    def forget(self, file) -> None:
+        """删除所有指向file的记录（该文件内容已被修改或文件已删除）"""
+        stale = [digest for digest, entry in self.index.items() if entry["file"] == file]
+        for digest in stale:
+            del self.index[digest]
+        if stale:
+            self.save()
+
+    def save(self) -> None:
+        """写回索引文件"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as j:
+            json.dump(self.index, j)
+
+
+
+class Catalog():
+    """
+    存储目录索引：记录文件夹中每个学生列表/布局文件的摘要信息
+
+    摘要包括name、count（学生数）、capacity（座位数）、time、mtime、size，
+    只有新增或被修改（mtime/size变化）的文件才会被解析
+    """
+
+    def __init__(self, folder, path) -> None:
+        self.folder = folder  # 被索引的文件夹
+        self.path = path  # 索引文件路径
+        self.entries = {}  # 文件名 -> 摘要
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as j:
+                    entries = json.load(j)
+            except (OSError, ValueError):
+                entries = None  # 索引损坏时重新扫描
+            if isinstance(entries, dict):
+                self.entries = entries
+
+    @staticmethod
+    def summarize(path) -> dict:
+        """解析文件并生成摘要"""
+        if path.lower().endswith(".roster"):
+            data = Roster_Store.read_head(path)  # 头部含name、time、count
+            count = data['count']
+        else:
+            with open(path, 'r', encoding='utf-8') as j:
+                data = json.load(j)
+            if not isinstance(data, dict):
+                raise ValueError(f"不是学生列表或布局文件: {path}")
+            count = len(data['stu_list']) if 'stu_list' in data else None
+        capacity = None
+        if data.get('format') == "grid":
+            capacity = sum(data['runs'][1::2])  # 奇数段为可用座位
+        elif 'map' in data:
+            capacity = sum(column['length'] for column in data['map'] if column['type'] == "seats")
+        stat = os.stat(path)
+        return {
+            "name": data['name'],
+            "count": count,
+            "capacity": capacity,
+            "time": data.get('time', ''),
+            "mtime": stat.st_mtime,
+            "size": stat.st_size
+        }
+
+    def sync(self) -> list:
+        """
+        与文件夹内容对齐，返回[(文件路径, 摘要), ...]
+
+        只对比文件的mtime和size，未变化的文件不会被重新解析
+        """
+        changed = False
+        seen = set()
+        if os.path.exists(self.folder):
+            with os.scandir(self.folder) as it:
+                for entry in it:
+                    if not entry.is_file():
+                        continue
+                    try:
+                        stat = entry.stat()
+                        old = self.entries.get(entry.name)
+                        if old and old["mtime"] == stat.st_mtime and old["size"] == stat.st_size:
+                            seen.add(entry.name)
+                            continue
+                        self.entries[entry.name] = self.summarize(entry.path)
+                        seen.add(entry.name)
+                    except (OSError, ValueError, KeyError, TypeError):
+                        # 不是有效的学生列表/布局文件，或扫描期间被删除、无法读取；旧摘要在下面移除
+                        continue
+                    changed = True
+
+        for name in list(self.entries):
+            if name not in seen:
+                del self.entries[name]
+                changed = True
+
+        if changed:
+            self.save()
+        return self.list()
+
+    def list(self) -> list:
+        """按文件名返回[(文件路径, 摘要), ...]，不访问文件夹"""
+        return [(os.path.join(self.folder, name), self.entries[name]) for name in sorted(self.entries)]
+
+    def add(self, path) -> dict:
+        """新增或更新一个文件的摘要"""
+        entry = self.summarize(path)
+        self.entries[os.path.basename(path)] = entry
+        self.save()
+        return entry
+
+    def remove(self, path) -> None:
+        """移除一个文件的摘要"""
+        if self.entries.pop(os.path.basename(path), None) is not None:
+            self.save()
+
+    def save(self) -> None:
+        """写回索引文件"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as j:
+            json.dump(self.entries, j, ensure_ascii=False)
+
+
+
+class Layout_Cache():
+    """
+    编译布局缓存：以布局文件内容的哈希为键，保存Compiled_Layout
+
+    先查内存，再查folder中的.npz文件，都没有时才解析JSON并编译；
+    磁盘上超过max_entries个文件时删除最久未使用的
+    """
+
+    def __init__(self, folder, max_entries: int = 128) -> None:
+        self.folder = folder  # 缓存文件夹
+        self.max_entries = max_entries
+        self.memory = {}  # 哈希 -> Compiled_Layout
+        self.lock = threading.Lock()
+
+    @timing.timed("Layout_Cache.load")
+    def load(self, path) -> Compiled_Layout:
+        """读取布局文件对应的Compiled_Layout"""
+        digest = Roster_Cache.file_hash(path)
+        with self.lock:
+            compiled = self.memory.get(digest)
+            if compiled is not None:
+                return compiled
+
+            cache_path = os.path.join(self.folder, f"{digest}.npz")
+            if os.path.exists(cache_path):
+                compiled = Compiled_Layout.load(cache_path)
+                os.utime(cache_path)  # 记录最近使用时间
+            else:
+                compiled = Compiled_Layout.compile(Layout_Connector(path))
+                os.makedirs(self.folder, exist_ok=True)
+                compiled.save(cache_path)
+                self.evict()
+
+            self.memory[digest] = compiled
+            while len(self.memory) > self.max_entries:
+                del self.memory[next(iter(self.memory))]
+            return compiled
+
+    def evict(self) -> None:
+        """删除最久未使用的缓存文件"""
+        with os.scandir(self.folder) as it:
+            files = [entry for entry in it if entry.name.endswith(".npz")]
+        if len(files) <= self.max_entries:
+            return
+        files.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in files[:len(files)-self.max_entries]:
+            os.remove(entry.path)
+
+
+class Prefetcher():
+    """
+    后台预读：在线程池中执行loader(path)并按路径缓存结果
+
+    文件的修改时间或大小变化后缓存自动失效，下次请求时重新读取；
+    读取失败的结果不缓存，超过max_entries个路径时丢弃最久未请求的
+    """
+
+    def __init__(self, loader, max_entries: int = 8) -> None:
+        self.loader = loader  # 读取函数，参数为文件路径
+        self.max_entries = max_entries
+        self.entries = {}  # 路径 -> (文件状态, Future)
+        self.lock = threading.Lock()
+        self.pool = ThreadPoolExecutor(max_workers=2)
+
+    @staticmethod
+    def stamp(path) -> tuple:
+        """文件状态：(修改时间, 大小)"""
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def request(self, path):
+        """开始预读（已缓存且文件未变化时不重复读取），返回Future"""
+        stamp = self.stamp(path)
+        with self.lock:
+            entry = self.entries.pop(path, None)
+            if entry is not None and entry[0] == stamp:
+                future = entry[1]
+                if not (future.done() and future.exception() is not None):
+                    self.entries[path] = entry  # 移到末尾
+                    return future
+
+            future = self.pool.submit(self.loader, path)
+            self.entries[path] = (stamp, future)
+            while len(self.entries) > self.max_entries:
+                del self.entries[next(iter(self.entries))]
+            return future
+
+    def get(self, path):
+        """返回path的读取结果，尚未读完时等待，未预读时立即读取"""
+        return self.request(path).result()
+
+    def invalidate(self, path=None) -> None:
+        """丢弃path的缓存，path为None时丢弃全部"""
+        with self.lock:
+            if path is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(path, None)
@@ -2,16 +2,23 @@ import sys
 import os
 import json
 import time
+_START_TIME = time.perf_counter()  # 启动计时起点
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QLineEdit, QSpinBox, QComboBox, QFileDialog,
-    QTableWidget, QTableWidgetItem, QDialog, QGroupBox, QMessageBox,
-    QScrollArea, QGridLayout, QFrame, QDialogButtonBox, QSlider, QHeaderView
+    QTableView, QDialog, QGroupBox, QMessageBox,
+    QScrollArea, QGridLayout, QFrame, QDialogButtonBox, QSlider, QHeaderView,
+    QProgressDialog
 )
-from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QAction, QColor, QFont
+from PySide6.QtCore import (
+    Qt, Signal, QObject, QEvent, QTimer, QAbstractTableModel, QModelIndex,
+    QRunnable, QThreadPool, QFileSystemWatcher
+)
+from PySide6.QtGui import QAction, QColor, QFont, QShortcut, QKeySequence
 import shutil
 import lib
+import exporter
+import timing
 
 
 class NameDialog(QDialog):
@@ -53,7 +60,7 @@ class StoredItemWidget(QFrame):
     selected = Signal(str)  # 当该项被选中时发射信号，参数为文件路径
     deleted = Signal(str)   # 当该项被删除时发射信号，参数为文件路径
 
-    def __init__(self, file_path, parent=None):
+    def __init__(self, file_path, entry, parent=None):
         super().__init__(parent)
         self.file_path = file_path
         self.setFrameStyle(QFrame.Box)
@@ -63,10 +70,14 @@ class StoredItemWidget(QFrame):
         layout = QVBoxLayout()
 
         # 显示文件名
-        name = self.get_name(file_path)
-        name_label = QLabel(name)
-        name_label.setWordWrap(True)
-        layout.addWidget(name_label)
+        self.name_label = QLabel()
+        self.name_label.setWordWrap(True)
+        layout.addWidget(self.name_label)
+
+        # 显示人数或座位数
+        self.info_label = QLabel()
+        layout.addWidget(self.info_label)
+        self.set_entry(entry)
 
         # 显示文件路径（截断）
         path_label = QLabel(file_path)
@@ -90,6 +101,15 @@ class StoredItemWidget(QFrame):
         layout.addLayout(buttons_layout)
         self.setLayout(layout)
 
+    def set_entry(self, entry):
+        """更新显示的摘要信息"""
+        self.entry = entry
+        self.name_label.setText(entry["name"])
+        if entry["count"] is not None:
+            self.info_label.setText(f"人数: {entry['count']}")
+        else:
+            self.info_label.setText(f"座位数: {entry['capacity']}")
+
     def on_select_clicked(self):
         self.selected.emit(self.file_path)
 
@@ -106,10 +126,188 @@ class StoredItemWidget(QFrame):
         if reply == QMessageBox.Yes:
             self.deleted.emit(self.file_path)
 
-    def get_name(self, path) -> str:
-        with open(path, 'r', encoding='utf-8') as j:
-            data = json.load(j)
-        return data["name"]
+
+class SeatTableModel(QAbstractTableModel):
+    """
+    座位表数据模型
+
+    只在视图请求可见单元格时返回数据，不为每名学生创建单元格对象
+    第0行为讲台，学生(x, y)显示在第y+1行第x列
+    """
+
+    male_color = QColor("#87CEEB")
+    female_color = QColor("#FFB6C1")
+    head_color = QColor("#C7C7C7")
+
+    def __init__(self, head_font, name_font, parent=None):
+        super().__init__(parent)
+        self.head_font = head_font
+        self.name_font = name_font
+        self.rows = 0
+        self.columns = 0
+        self.cells = {}  # (行, 列) -> Student
+        self.message = None  # 错误信息，不为None时只显示这一格
+
+    def set_result(self, result, display_unit):
+        """载入随机结果"""
+        self.beginResetModel()
+        (self.columns, self.rows) = display_unit
+        self.cells = {(y+1, x): stu for x, y, stu in result}
+        self.message = None
+        self.endResetModel()
+
+    def set_message(self, message):
+        """只显示一条错误信息"""
+        self.beginResetModel()
+        self.rows = self.columns = 1
+        self.cells = {}
+        self.message = message
+        self.endResetModel()
+
+    def refresh_fonts(self):
+        """字体变化后通知视图重绘"""
+        if self.rows and self.columns:
+            self.dataChanged.emit(
+                self.index(0, 0), self.index(self.rows-1, self.columns-1),
+                [Qt.FontRole])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.columns
+
+    def data(self, index, role=Qt.DisplayRole):
+        row, column = index.row(), index.column()
+
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+
+        # 错误情况
+        if self.message is not None:
+            return self.message if role == Qt.DisplayRole else None
+
+        # 讲台
+        if row == 0:
+            if column != 0:
+                return None
+            if role == Qt.DisplayRole:
+                return "讲台"
+            if role == Qt.BackgroundRole:
+                return self.head_color
+            if role == Qt.FontRole:
+                return self.head_font
+            return None
+
+        stu = self.cells.get((row, column))
+        if stu is None:
+            return None
+        if role == Qt.DisplayRole:
+            return stu.name
+        if role == Qt.BackgroundRole:
+            # 根据性别设置不同的背景色
+            return self.male_color if stu.sex else self.female_color
+        if role == Qt.FontRole:
+            return self.name_font
+        return None
+
+
+class ExportSignals(QObject):
+    """导出任务的信号"""
+    finished = Signal(str)  # 导出完成，参数为文件路径
+    failed = Signal(str)    # 导出失败，参数为错误信息
+
+
+class ExportTask(QRunnable):
+    """在线程池中导出座位表，不阻塞界面"""
+
+    def __init__(self, path, result, display_unit, ways):
+        super().__init__()
+        self.path = path
+        self.result = result
+        self.display_unit = display_unit
+        self.ways = ways
+        self.signals = ExportSignals()
+
+    def run(self):
+        try:
+            exporter.export(self.path, self.result, self.display_unit, self.ways)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(self.path)
+
+
+class GenerateSignals(QObject):
+    """生成任务的信号"""
+    progress = Signal(int, str)  # 进度百分比、当前步骤
+    finished = Signal(object)    # 成功传随机后的Compact_Classs类，失败传错误代码
+    failed = Signal(str)         # 出现异常，参数为错误信息
+    cancelled = Signal()         # 已取消
+
+
+def read_student_list(path) -> list:
+    """读取学生列表文件，供预读使用"""
+    stu_op = lib.Student_Operate()
+    stu_op.read(path)  # .roster文件按需读取学生
+    return stu_op.get_stu_list()
+
+
+class GenerateTask(QRunnable):
+    """在线程池中随机分配，布局和学生列表从预读缓存中取得，不阻塞界面"""
+
+    def __init__(self, layout_path, student_list_path, layout_prefetch, student_prefetch):
+        super().__init__()
+        self.layout_path = layout_path
+        self.layout_prefetch = layout_prefetch  # 编译布局预读
+        self.student_list_path = student_list_path
+        self.student_prefetch = student_prefetch  # 学生列表预读
+        self.is_cancelled = False
+        self.signals = GenerateSignals()
+
+    def cancel(self):
+        """请求取消，在下一个步骤开始前生效"""
+        self.is_cancelled = True
+
+    def step(self, percent, text) -> bool:
+        """报告进度，已取消时返回False"""
+        if self.is_cancelled:
+            self.signals.cancelled.emit()
+            return False
+        self.signals.progress.emit(percent, text)
+        return True
+
+    def run(self):
+        try:
+            # 链接布局（选择时已开始预读，通常无需等待）
+            if not self.step(0, "正在读取布局..."):
+                return
+            layout = self.layout_prefetch.get(self.layout_path)
+
+            # 链接学生列表
+            if not self.step(25, "正在读取学生列表..."):
+                return
+            stu_list = self.student_prefetch.get(self.student_list_path)
+
+            # 实例化班级
+            if not self.step(50, "正在创建班级..."):
+                return
+            classs = lib.Compact_Classs(layout)
+
+            # 失败传错误代码，成功传随机后的Classs类
+            if not self.step(75, "正在随机分配..."):
+                return
+            final = classs.check(stu_list)
+            if final == False:
+                classs.random(stu_list)
+                final = classs
+
+            if not self.step(100, "完成"):
+                return
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(final)
 
 
 class ResultWindow(QDialog):
@@ -165,35 +363,44 @@ class ResultWindow(QDialog):
         # 添加伸缩空间，将后面的元素推到右边
         control_layout.addStretch()
 
+        # 导出按钮
+        self.export_btn = QPushButton("导出")
+        self.export_btn.clicked.connect(self.export_table)
+        self.export_btn.setEnabled(False)
+        control_layout.addWidget(self.export_btn)
+
         # 全屏按钮（右顶格）
         self.fullscreen_btn = QPushButton("全屏")  # 改为实例变量
         self.fullscreen_btn.clicked.connect(self.toggle_fullscreen)
         control_layout.addWidget(self.fullscreen_btn)
 
-        # 创建表格显示区
-        self.table_widget = QTableWidget()
-        self.table_widget.setAlternatingRowColors(False)
+        # 创建表格显示区（模型/视图，只绘制可见单元格）
+        self.table_model = SeatTableModel(self.head_font, self.name_font, self)
+        self.table_view = QTableView()
+        self.table_view.setModel(self.table_model)
+        self.table_view.setAlternatingRowColors(False)
 
         # 设置表格样式
-        self.table_widget.setStyleSheet("""
-            QTableWidget {
+        self.table_view.setStyleSheet("""
+            QTableView {
                 gridline-color: black;
             }
         """)
 
         # 设置表头调整模式
-        self.table_widget.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
-        self.table_widget.verticalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.table_view.verticalHeader().setSectionResizeMode(QHeaderView.Interactive)
 
         # 添加到主布局
         layout.addLayout(control_layout)
-        layout.addWidget(self.table_widget)
+        layout.addWidget(self.table_view)
 
         self.setLayout(layout)
 
         self.way_columns: list
-        self.stu_dic: dict
+        self.result: lib.Seating_Result
         self.display_unit: tuple
+        self.max_name_length = 0
 
     def toggle_fullscreen(self):
         """切换全屏状态"""
@@ -206,6 +413,36 @@ class ResultWindow(QDialog):
             self.is_fullscreen = True
             self.fullscreen_btn.setText("退出全屏")  # 进入全屏时显示"退出全屏"
 
+    def export_table(self):
+        """导出座位表为PNG/PDF/XLSX/CSV，在后台线程中进行"""
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "导出座位表", "座位表.png",
+            "PNG图片 (*.png);;PDF文档 (*.pdf);;Excel表格 (*.xlsx);;CSV表格 (*.csv)"
+        )
+        if not file_path:
+            return
+        if os.path.splitext(file_path)[1].lower() not in exporter.FORMATS:
+            QMessageBox.warning(self, "警告", "不支持的导出格式!")
+            return
+
+        task = ExportTask(file_path, self.result, self.display_unit, self.way_columns)
+        task.signals.finished.connect(self.on_export_finished)
+        task.signals.failed.connect(self.on_export_failed)
+        self.export_task = task  # 保持信号对象存活
+        self.export_btn.setEnabled(False)
+        self.export_btn.setText("导出中...")
+        QThreadPool.globalInstance().start(task)
+
+    def on_export_finished(self, path):
+        self.export_btn.setEnabled(True)
+        self.export_btn.setText("导出")
+        QMessageBox.information(self, "成功", f"已导出到: {path}")
+
+    def on_export_failed(self, message):
+        self.export_btn.setEnabled(True)
+        self.export_btn.setText("导出")
+        QMessageBox.critical(self, "错误", f"导出失败: {message}")
+
     def update_size(self, value):
         """当缩放更新时执行"""
 
@@ -229,31 +466,32 @@ class ResultWindow(QDialog):
         self.name_font.setFamily("KaiTi")
         self.name_font.setPixelSize(self.f_name_fontPixel)
 
+    @timing.timed("ResultWindow.first_show_table_data")
     def first_show_table_data(self, data):
         """首次填充文字、合并单元格、调整缩放"""
-        table = self.table_widget
+        table = self.table_view
 
         # 填充文字
-        if type(data) != lib.Classs:
+        if not isinstance(data, (lib.Classs, lib.Compact_Classs)):
             # 错误情况
-            table.setRowCount(1)
-            table.setColumnCount(1)
-            item = QTableWidgetItem(
+            self.table_model.set_message(
                 f"随机程序意外终止，错误代码：{'None' if data==None else data}")
-            item.setTextAlignment(Qt.AlignCenter)
-            table.setItem(0, 0, item)
             return
 
         # 成功情况
         classs = data
+        if classs.seed is not None:
+            self.setWindowTitle(f"座位安排结果 - 种子 {classs.seed}")
         (columns, rows) = classs.display_unit()
 
-        table.setRowCount(rows)
-        table.setColumnCount(columns)
-
         # 重复利用传参
-        self.stu_dic = classs.get_processed_data()
+        self.result = classs.get_result()
         self.display_unit = classs.display_unit()
+        self.table_model.set_result(self.result, self.display_unit)
+        self.export_btn.setEnabled(True)
+
+        # 寻找最长名字
+        self.max_name_length = max(len(stu.name) for _, _, stu in self.result)
 
         # 合并过道并记录过道列
         ways = classs.way_gather()
@@ -266,73 +504,41 @@ class ResultWindow(QDialog):
 
         self.table_update()
     
+    @timing.timed("ResultWindow.table_update")
     def table_update(self):
         """表格更新"""
-        stu_dic = self.stu_dic
-        table = self.table_widget
-        unit = self.display_unit
+        table = self.table_view
         ways = self.way_columns
 
         '''刷新单元格内容'''
-        # 放置学生
-        for key in stu_dic.keys():
-            # 解析位置
-            coords = key.strip('()').split(',')
-            x, y = int(coords[0].strip()), int(coords[1].strip())+1
-
-            # 解析学生信息
-            stu_dict = stu_dic[key]
-            name = stu_dict['name']
-            sex = stu_dict['sex']
-
-            # 填充数据
-            item = QTableWidgetItem(name)
-            item.setFont(self.name_font)
-            item.setTextAlignment(Qt.AlignCenter)
-            # 根据性别设置不同的背景色
-            if sex:
-                item.setBackground(QColor("#87CEEB"))
-            else:
-                item.setBackground(QColor("#FFB6C1"))
-            table.setItem(y, x, item)
-        
-            # 讲台
-            item = QTableWidgetItem("讲台")
-            item.setBackground(QColor("#C7C7C7"))
-            item.setFont(self.head_font)
-            item.setTextAlignment(Qt.AlignCenter)
-            table.setItem(0, 0, item)
+        # 字体对象已在change_QFont中原地更新，只需通知视图重绘
+        self.table_model.refresh_fonts()
         
         '''刷新单元格大小'''
         # 计算讲台行的高度
         head_height_pixel = int(self.f_head_fontPixel*2)
 
-        # 寻找最长名字
-        __lengths = []
-        for i in stu_dic.values():
-            name: str = i['name']
-            __lengths.append(len(name))
-        max_length = max(__lengths)
-
         # 计算姓名单元格尺寸
-        normal_weight_pixel = int(max_length*self.f_name_fontPixel*1.7)
+        normal_weight_pixel = int(self.max_name_length*self.f_name_fontPixel*1.7)
         normal_height_pixel = int(self.f_name_fontPixel*1.4)
 
         # 计算过道列的宽度
         way_weight_pixel = int(normal_weight_pixel*0.6)
 
-        # 更改表格尺寸
-        table = self.table_widget
+        # 更改普通尺寸（默认尺寸对所有行列生效，无需逐行设置）
+        horizontal = table.horizontalHeader()
+        vertical = table.verticalHeader()
+        horizontal.setMinimumSectionSize(1)
+        vertical.setMinimumSectionSize(1)
+        horizontal.setDefaultSectionSize(normal_weight_pixel)
+        vertical.setDefaultSectionSize(normal_height_pixel)
+        for column_index in range(horizontal.count()):
+            if horizontal.sectionSize(column_index) != normal_weight_pixel:
+                horizontal.resizeSection(column_index, normal_weight_pixel)
 
         # 更改讲台行高
         table.setRowHeight(0, head_height_pixel)
 
-        # 更改普通尺寸
-        for column_index in range(0, unit[0]+1):
-            table.setColumnWidth(column_index, normal_weight_pixel)
-        for row_index in range(1, unit[1]+1):
-            table.setRowHeight(row_index, normal_height_pixel)
-
         # 更改过道列宽
         for column_index in ways:
             table.setColumnWidth(column_index, way_weight_pixel)
@@ -352,6 +558,25 @@ class MainWindow(QMainWindow):
         # 设置存储文件夹路径
         self.students_folder = ".\\students"  # 学生列表存储文件夹
         self.layouts_folder = ".\\layouts"    # 布局存储文件夹
+        self.cache_folder = ".\\cache"      # 缓存文件夹
+
+        # 名单导入缓存
+        self.roster_cache = lib.Roster_Cache(
+            os.path.join(self.cache_folder, "rosters.json"))
+
+        # 编译布局缓存
+        self.layout_cache = lib.Layout_Cache(
+            os.path.join(self.cache_folder, "layouts"))
+
+        # 选择后即在后台读取，生成时直接使用
+        self.layout_prefetch = lib.Prefetcher(self.layout_cache.load)
+        self.student_prefetch = lib.Prefetcher(read_student_list)
+
+        # 存储目录索引，列出文件时无需解析文件内容
+        self.student_catalog = lib.Catalog(
+            self.students_folder, os.path.join(self.cache_folder, "students_catalog.json"))
+        self.layout_catalog = lib.Catalog(
+            self.layouts_folder, os.path.join(self.cache_folder, "layouts_catalog.json"))
 
         # 确保文件夹存在
         os.makedirs(self.students_folder, exist_ok=True)
@@ -375,6 +600,11 @@ class MainWindow(QMainWindow):
         import_student_btn.clicked.connect(self.import_student_list)
         student_layout.addWidget(import_student_btn)
 
+        # 用新表格更新所选学生列表按钮
+        update_student_btn = QPushButton("用表格更新所选学生列表")
+        update_student_btn.clicked.connect(self.update_student_list)
+        student_layout.addWidget(update_student_btn)
+
         # 已存储学生列表区域
         student_stored_label = QLabel("已存储的学生列表:")
         student_layout.addWidget(student_stored_label)
@@ -429,35 +659,111 @@ class MainWindow(QMainWindow):
         self.generate_btn.clicked.connect(self.generate_seating)
         main_layout.addWidget(self.generate_btn)
 
+        # 已显示的小部件：文件路径 -> StoredItemWidget
+        self.student_items = {}
+        self.layout_items = {}
+
+        # 监视存储文件夹，外部的增删改也会同步到界面
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.addPaths([self.students_folder, self.layouts_folder])
+        self.watcher.directoryChanged.connect(self.on_stored_path_changed)
+        self.watcher.fileChanged.connect(self.on_stored_path_changed)
+
+        # 短时间内的多次变化只同步一次
+        self.student_sync_timer = QTimer(self)
+        self.student_sync_timer.setSingleShot(True)
+        self.student_sync_timer.setInterval(200)
+        self.student_sync_timer.timeout.connect(self.sync_stored_student_lists)
+        self.layout_sync_timer = QTimer(self)
+        self.layout_sync_timer.setSingleShot(True)
+        self.layout_sync_timer.setInterval(200)
+        self.layout_sync_timer.timeout.connect(self.sync_stored_layouts)
+
         # 初始化扫描存储的文件
         self.scan_stored_files()
 
+        # Ctrl+Shift+T开关阶段耗时记录
+        self.timing_shortcut = QShortcut(QKeySequence("Ctrl+Shift+T"), self)
+        self.timing_shortcut.activated.connect(self.toggle_timing)
+
+    def toggle_timing(self):
+        """开始记录阶段耗时；再次按下时停止，导出时间线并显示汇总"""
+        if not timing.is_enabled():
+            timing.clear()
+            timing.enable()
+            QMessageBox.information(self, "耗时记录", "已开始记录，再次按Ctrl+Shift+T停止并导出。")
+            return
+
+        timing.disable()
+        os.makedirs(self.cache_folder, exist_ok=True)
+        file_name = time.strftime("%Y%m%d_%H%M%S", time.localtime())
+        path = os.path.join(self.cache_folder, f"trace_{file_name}.json")
+        timing.export_chrome(path)
+        QMessageBox.information(self, "耗时记录", f"时间线已导出到 {path}\n\n{timing.format_summary()}")
+
     def scan_stored_files(self):
         """扫描存储的学生列表和布局文件"""
-        # 清空当前显示
-        self.clear_layout(self.student_stored_layout)
-        self.clear_layout(self.layout_stored_layout)
-
-        # 扫描学生列表文件夹
-        if os.path.exists(self.students_folder):
-            for file_name in os.listdir(self.students_folder):
-                file_path = os.path.join(self.students_folder, file_name)
-                if os.path.isfile(file_path):
-                    self.add_stored_student_list(file_path)
-
-        # 扫描布局文件夹
-        if os.path.exists(self.layouts_folder):
-            for file_name in os.listdir(self.layouts_folder):
-                file_path = os.path.join(self.layouts_folder, file_name)
-                if os.path.isfile(file_path):
-                    self.add_stored_layout(file_path)
-
-    def clear_layout(self, layout):
-        """清空布局中的所有小部件"""
-        while layout.count():
-            child = layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
+        self.sync_stored_student_lists()
+        self.sync_stored_layouts()
+
+    def sync_stored_student_lists(self):
+        """同步学生列表文件夹（仅解析新增或被修改的文件）"""
+        self.sync_stored(self.student_catalog, self.student_stored_layout,
+                         self.student_items, self.add_stored_student_list)
+
+    def sync_stored_layouts(self):
+        """同步布局文件夹"""
+        self.sync_stored(self.layout_catalog, self.layout_stored_layout,
+                         self.layout_items, self.add_stored_layout)
+
+    def sync_stored(self, catalog, layout, items, add_func):
+        """只增删改受影响的小部件，其余小部件保持不变"""
+        entries = catalog.sync()
+        current = dict(entries)
+
+        # 移除已不存在的文件
+        for file_path in list(items):
+            if file_path not in current:
+                widget = items.pop(file_path)
+                layout.removeWidget(widget)
+                widget.deleteLater()
+
+        # 新增或更新
+        for index, (file_path, entry) in enumerate(entries):
+            widget = items.get(file_path)
+            if widget is None:
+                items[file_path] = add_func(file_path, entry, index)
+            elif widget.entry != entry:
+                widget.set_entry(entry)
+
+        # 文件被替换后监视会失效，重新加入
+        watched = set(self.watcher.files())
+        missing = [file_path for file_path in current if file_path not in watched]
+        if missing:
+            self.watcher.addPaths(missing)
+
+    def on_stored_path_changed(self, path):
+        """文件夹或文件发生变化"""
+        path = os.path.normpath(path)
+        if path == os.path.normpath(self.students_folder) or \
+                os.path.dirname(path) == os.path.normpath(self.students_folder):
+            self.student_sync_timer.start()
+        else:
+            self.layout_sync_timer.start()
+
+        # 已选择的文件被修改时重新预读
+        self.prefetch_selected()
+
+    def prefetch_selected(self):
+        """预读当前选择的学生列表和布局，文件未变化时不重复读取"""
+        for prefetch, path in ((self.student_prefetch, self.selected_student_list),
+                               (self.layout_prefetch, self.selected_layout)):
+            if path:
+                try:
+                    prefetch.request(path)
+                except OSError:
+                    # 文件已被删除，等待同步
+                    prefetch.invalidate(path)
 
     def import_student_list(self):
         """导入学生列表"""
@@ -466,6 +772,15 @@ class MainWindow(QMainWindow):
             self, "选择学生列表", "", "Excel Files (*.xlsx)"
         )
         if file_path:
+            # 同一份表格已导入过时直接使用已存储的列表
+            digest = lib.Roster_Cache.file_hash(file_path)
+            stored_path = self.roster_cache.lookup(digest)
+            if stored_path:
+                self.select_student_list(stored_path)
+                QMessageBox.information(
+                    self, "提示", f"该表格已导入过，已直接选择 {os.path.basename(stored_path)}")
+                return
+
             # 显示命名对话框
             default_name = os.path.splitext(os.path.basename(file_path))[0]
             name_dialog = NameDialog(default_name, self)
@@ -501,9 +816,11 @@ class MainWindow(QMainWindow):
                     file_name = operator.save_to_json(
                         name, self.students_folder)
                     dest_path = os.path.join(self.students_folder, file_name)
+                    self.roster_cache.add(digest, dest_path)
+                    self.student_catalog.add(dest_path)
 
-                    # 重新扫描存储的文件
-                    self.scan_stored_files()
+                    # 同步存储的文件
+                    self.sync_stored_student_lists()
 
                     # 自动选择新导入的列表
                     self.select_student_list(dest_path)
@@ -513,6 +830,38 @@ class MainWindow(QMainWindow):
                 except Exception as e:
                     QMessageBox.critical(self, "错误", f"导入学生列表时出错: {str(e)}")
 
+    def update_student_list(self):
+        """用新的Excel表格更新所选学生列表，只改动有变化的学生"""
+        if not self.selected_student_list:
+            QMessageBox.warning(self, "警告", "请先选择要更新的学生列表!")
+            return
+
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "选择学生列表", "", "Excel Files (*.xlsx)"
+        )
+        if file_path:
+            try:
+                operator = lib.Student_Operate()
+                operator.read_from_xlsx(file_path)
+                # 先释放预读的列表（.roster文件被映射时无法替换）
+                self.student_prefetch.invalidate(self.selected_student_list)
+                diff = operator.update_stored(self.selected_student_list)
+                self.prefetch_selected()
+
+                # 之前导入的表格已不再对应该列表；之后再导入同一份表格时直接使用该列表
+                self.roster_cache.forget(self.selected_student_list)
+                self.roster_cache.add(lib.Roster_Cache.file_hash(file_path), self.selected_student_list)
+                self.student_catalog.add(self.selected_student_list)
+                self.sync_stored_student_lists()
+
+                QMessageBox.information(
+                    self, "成功",
+                    f"学生列表 '{operator.name}' 已更新：新增{len(diff['added'])}人，"
+                    f"移除{len(diff['removed'])}人，修改{len(diff['changed'])}人")
+
+            except Exception as e:
+                QMessageBox.critical(self, "错误", f"更新学生列表时出错: {str(e)}")
+
     def import_layout(self):
         """导入布局"""
         file_path, _ = QFileDialog.getOpenFileName(
@@ -526,50 +875,58 @@ class MainWindow(QMainWindow):
                 self.layouts_folder, f"{file_name}.json")
             shutil.copy2(file_path, dest_path)
 
-            with open(dest_path, 'r', encoding='utf-8') as j:
-                data = json.load(j)
-            name = data["name"]
-            # 重新扫描存储的文件
-            self.scan_stored_files()
+            name = self.layout_catalog.add(dest_path)["name"]
+            # 同步存储的文件
+            self.sync_stored_layouts()
 
             # 自动选择新导入的布局
             self.select_layout(dest_path)
 
             QMessageBox.information(self, "成功", f"布局 '{name}' 导入成功!")
 
-    def add_stored_student_list(self, file_path):
+    def add_stored_student_list(self, file_path, entry, index=-1):
         """添加已存储的学生列表到界面"""
-        item_widget = StoredItemWidget(file_path)
+        item_widget = StoredItemWidget(file_path, entry)
         item_widget.selected.connect(self.select_student_list)
         item_widget.deleted.connect(self.delete_student_list)
-        self.student_stored_layout.addWidget(item_widget)
+        self.student_stored_layout.insertWidget(index, item_widget)
+        return item_widget
 
-    def add_stored_layout(self, file_path):
+    def add_stored_layout(self, file_path, entry, index=-1):
         """添加已存储的布局到界面"""
-        item_widget = StoredItemWidget(file_path)
+        item_widget = StoredItemWidget(file_path, entry)
         item_widget.selected.connect(self.select_layout)
         item_widget.deleted.connect(self.delete_layout)
-        self.layout_stored_layout.addWidget(item_widget)
+        self.layout_stored_layout.insertWidget(index, item_widget)
+        return item_widget
 
     def select_student_list(self, file_path):
         """选择学生列表"""
         self.selected_student_list = file_path
         file_name = os.path.basename(file_path)
         self.current_student_label.setText(f"当前选择: {file_name}")
+        self.prefetch_selected()
 
     def select_layout(self, file_path):
         """选择布局"""
         self.selected_layout = file_path
         file_name = os.path.basename(file_path)
         self.current_layout_label.setText(f"当前选择: {file_name}")
+        self.prefetch_selected()
 
     def delete_student_list(self, file_path):
         """删除学生列表"""
         # 在这里接入删除学生列表功能
-        os.remove(file_path)
+        self.student_prefetch.invalidate(file_path)  # 释放预读的列表
+        try:
+            os.remove(file_path)
+        except OSError as e:
+            QMessageBox.critical(self, "错误", f"删除学生列表时出错: {str(e)}")
+            return
+        self.student_catalog.remove(file_path)
 
-        # 重新扫描存储的文件
-        self.scan_stored_files()
+        # 同步存储的文件
+        self.sync_stored_student_lists()
 
         # 如果删除的是当前选中的列表，清空选择
         if self.selected_student_list == file_path:
@@ -579,10 +936,16 @@ class MainWindow(QMainWindow):
     def delete_layout(self, file_path):
         """删除布局"""
         # 在这里接入删除布局功能
-        os.remove(file_path)
+        self.layout_prefetch.invalidate(file_path)
+        try:
+            os.remove(file_path)
+        except OSError as e:
+            QMessageBox.critical(self, "错误", f"删除布局时出错: {str(e)}")
+            return
+        self.layout_catalog.remove(file_path)
 
-        # 重新扫描存储的文件
-        self.scan_stored_files()
+        # 同步存储的文件
+        self.sync_stored_layouts()
 
         # 如果删除的是当前选中的布局，清空选择
         if self.selected_layout == file_path:
@@ -600,23 +963,56 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "警告", "请先选择教室布局!")
             return
 
-        # 链接布局
-        layout = lib.Layout_Connector(self.selected_layout)
-
-        # 链接学生列表
-        stu_op = lib.Student_Operate()
-        stu_op.read_from_json(self.selected_student_list)
-        stu_list = stu_op.get_stu_list()
-
-        # 实例化班级
-        classs = lib.Classs(layout)
-        # 失败传错误代码，成功传随机后的Classs类
-        final = classs.check(stu_list)
-        if final == False:
-            classs.random(stu_list)
-            self.show_result_window(classs)
-        else:
-            self.show_result_window(final)
+        # 在后台线程中生成，界面只显示进度
+        task = GenerateTask(self.selected_layout, self.selected_student_list,
+                            self.layout_prefetch, self.student_prefetch)
+        self.generate_task = task  # 保持信号对象存活
+
+        progress = QProgressDialog("正在准备...", "取消", 0, 100, self)
+        progress.setWindowTitle("生成座位安排")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(300)  # 很快完成时不弹出
+        progress.canceled.connect(task.cancel)
+        self.generate_progress = progress
+
+        task.signals.progress.connect(self.on_generate_progress)
+        task.signals.finished.connect(self.on_generate_finished)
+        task.signals.failed.connect(self.on_generate_failed)
+        task.signals.cancelled.connect(self.on_generate_cancelled)
+
+        self.generate_btn.setEnabled(False)
+        QThreadPool.globalInstance().start(task)
+
+    def on_generate_progress(self, percent, text):
+        """更新生成进度"""
+        if self.generate_progress is None or self.generate_progress.wasCanceled():
+            return
+        self.generate_progress.setLabelText(text)
+        self.generate_progress.setValue(percent)
+
+    def end_generate(self):
+        """生成结束，恢复界面"""
+        if self.generate_progress is not None:
+            # 每次生成都会新建进度对话框，结束后删除
+            self.generate_progress.reset()
+            self.generate_progress.deleteLater()
+            self.generate_progress = None
+        self.generate_btn.setEnabled(True)
+        self.generate_task = None
+
+    def on_generate_finished(self, data):
+        """生成完成，显示结果"""
+        cancelled = self.generate_task is None or self.generate_task.is_cancelled
+        self.end_generate()
+        if not cancelled:
+            self.show_result_window(data)
+
+    def on_generate_failed(self, message):
+        self.end_generate()
+        QMessageBox.critical(self, "错误", f"生成座位安排时出错: {message}")
+
+    def on_generate_cancelled(self):
+        self.end_generate()
 
     def show_result_window(self, data):
         """显示结果窗口"""
@@ -628,10 +1024,75 @@ class MainWindow(QMainWindow):
         # 显示窗口
         self.result_window.exec()
 
+        # 关闭后释放结果：其学生列表可能映射着.roster文件，不释放时无法删除或更新该文件
+        self.result_window.result = None
+        self.result_window.deleteLater()
+        self.result_window = None
+
+
+class StartupTimer(QObject):
+    """
+    启动耗时测量：主窗口首次绘制后输出耗时并退出
+
+    用法: python main.py --startup-time [预算毫秒]
+    输出一行JSON；超出预算或启动时已加载pandas、numpy时退出码为1
+    """
+
+    def __init__(self, window, budget_ms=None):
+        super().__init__(window)
+        self.budget_ms = budget_ms
+        window.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            # 等本次绘制完成后再计时
+            QTimer.singleShot(0, self.report)
+        return False
+
+    def report(self):
+        elapsed_ms = (time.perf_counter() - _START_TIME) * 1000
+        pandas_loaded = "pandas" in sys.modules
+        numpy_loaded = "numpy" in sys.modules
+        print(json.dumps({
+            "startup_ms": round(elapsed_ms, 1),
+            "pandas_loaded": pandas_loaded,
+            "numpy_loaded": numpy_loaded
+        }), flush=True)
+        failed = pandas_loaded or numpy_loaded or (
+            self.budget_ms is not None and elapsed_ms > self.budget_ms)
+        QApplication.exit(1 if failed else 0)
+
 
 def main():
     app = QApplication(sys.argv)
     window = MainWindow()
+
+    # 启动耗时测量
+    if "--startup-time" in sys.argv:
+        index = sys.argv.index("--startup-time")
+        # 预算为可选参数，后面紧跟其他选项时不作为预算
+        budget = None
+        if len(sys.argv) > index+1:
+            try:
+                budget = float(sys.argv[index+1])
+            except ValueError:
+                pass
+        window.startup_timer = StartupTimer(window, budget)
+
+    # 记录阶段耗时，退出时导出时间线：--trace [路径]
+    if "--trace" in sys.argv:
+        index = sys.argv.index("--trace")
+        path = "trace.json"
+        if len(sys.argv) > index+1 and not sys.argv[index+1].startswith("--"):
+            path = sys.argv[index+1]
+        timing.enable()
+
+        def save_trace():
+            timing.export_chrome(path)
+            print(timing.format_summary(), file=sys.stderr)
+        app.aboutToQuit.connect(save_trace)
+
     window.show()
     sys.exit(app.exec())
 
@@ -0,0 +1,75 @@
+"""存储目录索引：无效文件与扫描期间的文件变化"""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lib  # noqa: E402
+
+
+def write_json(path, data):
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+
+def make_folder(tmp_path):
+    folder = tmp_path / "students"
+    folder.mkdir()
+    write_json(folder / "一班.json", {
+        "name": "一班", "time": "", "stu_list": [{"name": "甲", "id": "1", "sex": True}]
+    })
+    return folder
+
+
+def test_summarize_rejects_non_dict(tmp_path):
+    path = tmp_path / "list.json"
+    write_json(path, [1, 2])
+    try:
+        lib.Catalog.summarize(str(path))
+    except ValueError:
+        pass
+    else:
+        assert False, "应抛出ValueError"
+
+
+def test_sync_skips_stray_files(tmp_path):
+    """非JSON、非字典、缺字段的文件都不进入索引，也不影响其他文件"""
+    folder = make_folder(tmp_path)
+    (folder / "notes.txt").write_bytes(b"\xff\xfe not json")
+    write_json(folder / "array.json", [1, 2])
+    write_json(folder / "number.json", 3)
+    write_json(folder / "other.json", {"foo": 1})
+
+    catalog = lib.Catalog(str(folder), str(tmp_path / "index.json"))
+    entries = catalog.sync()
+    assert [os.path.basename(path) for path, _ in entries] == ["一班.json"]
+    assert entries[0][1]["count"] == 1
+
+
+def test_sync_drops_vanished_file(tmp_path, monkeypatch):
+    """扫描期间被删除的文件不抛出异常，旧摘要被移除"""
+    folder = make_folder(tmp_path)
+    write_json(folder / "二班.json", {"name": "二班", "time": "", "stu_list": []})
+    catalog = lib.Catalog(str(folder), str(tmp_path / "index.json"))
+    assert len(catalog.sync()) == 2
+
+    write_json(folder / "二班.json", {"name": "二班", "time": "", "stu_list": [], "extra": 1})
+    summarize = lib.Catalog.summarize
+
+    def vanish(path):
+        if path.endswith("二班.json"):
+            os.remove(path)
+        return summarize(path)
+    monkeypatch.setattr(lib.Catalog, "summarize", staticmethod(vanish))
+
+    entries = catalog.sync()
+    assert [os.path.basename(path) for path, _ in entries] == ["一班.json"]
+
+
+def test_corrupt_index_rebuilt(tmp_path):
+    folder = make_folder(tmp_path)
+    index = tmp_path / "index.json"
+    index.write_text("[", encoding="utf-8")
+    catalog = lib.Catalog(str(folder), str(index))
+    assert len(catalog.sync()) == 1
+    assert "一班.json" in json.loads(index.read_text(encoding="utf-8"))
@@ -0,0 +1,79 @@
+"""约束分配引擎：相邻判定与无法满足的约束"""
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lib  # noqa: E402
+
+
+def make_layout(tmp_path, columns):
+    path = tmp_path / "layout.json"
+    path.write_text(json.dumps({"name": "test", "time": "", "map": columns}), encoding="utf-8")
+    return lib.Layout_Connector(str(path))
+
+
+def seats(length):
+    return {"type": "seats", "start": 0, "length": length, "text": ""}
+
+
+WAY = {"type": "way", "start": 0, "length": 0, "text": "过道"}
+
+
+def make_students(count):
+    return [lib.Student(f"学生{i}", str(i), i % 2 == 0) for i in range(count)]
+
+
+def test_seats_across_aisle_not_adjacent(tmp_path):
+    """过道两侧同一排的座位不相邻"""
+    layout = make_layout(tmp_path, [seats(1), WAY, seats(1)])
+    classs = lib.Classs(layout)
+    solver = lib.Constraint_Solver(classs.get_all_avail_seats(), make_students(2), [])
+    assert classs.get_all_avail_seats() == [(0, 0), (2, 0)]
+    assert not solver.adjacent(0, 1)
+    assert solver.neighbours(0) == []
+
+
+def test_together_across_aisle_reported(tmp_path):
+    """唯一的两个座位隔着过道时，同桌约束无法满足并被返回"""
+    layout = make_layout(tmp_path, [seats(1), WAY, seats(1)])
+    stu_list = make_students(2)
+    rule = lib.Seat_Rule(stu_list[0], stu_list[1], lib.Seat_Rule.TOGETHER)
+    unsatisfied = lib.Classs(layout).random_constrained(stu_list, [rule], seed=1)
+    assert unsatisfied == [rule]
+
+
+def test_infeasible_rules_reported_quickly(tmp_path):
+    """一人最多4个相邻座位，要求与6人相邻时至少2条无法满足，且不会跑满步数"""
+    layout = make_layout(tmp_path, [seats(20) for _ in range(20)])
+    stu_list = make_students(400)
+    rules = [lib.Seat_Rule(stu_list[0], stu_list[i], lib.Seat_Rule.TOGETHER) for i in range(1, 7)]
+
+    start = time.perf_counter()
+    unsatisfied = lib.Compact_Classs(layout).random_constrained(stu_list, rules, seed=3)
+    assert time.perf_counter() - start < 2
+    assert len(unsatisfied) == 2
+    assert all(rule in rules for rule in unsatisfied)
+
+
+def test_feasible_rules_satisfied(tmp_path):
+    layout = make_layout(tmp_path, [seats(6) for _ in range(6)])
+    stu_list = make_students(30)
+    rules = [lib.Seat_Rule(stu_list[i], stu_list[i+1], lib.Seat_Rule.TOGETHER) for i in range(0, 10, 2)]
+    rules += [lib.Seat_Rule(stu_list[i], stu_list[i+10], lib.Seat_Rule.APART) for i in range(10)]
+    assert lib.Compact_Classs(layout).random_constrained(stu_list, rules, seed=5) == []
+
+
+def test_unknown_student_raises(tmp_path):
+    layout = make_layout(tmp_path, [seats(4)])
+    stu_list = make_students(3)
+    stranger = lib.Student("外人", "x", True)
+    rule = lib.Seat_Rule(stu_list[0], stranger, lib.Seat_Rule.APART)
+    try:
+        lib.Classs(layout).random_constrained(stu_list, [rule])
+    except ValueError:
+        pass
+    else:
+        assert False, "应抛出ValueError"
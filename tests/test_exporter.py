@@ -0,0 +1,37 @@
+"""座位表导出：PNG尺寸上限与保存失败"""
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import exporter  # noqa: E402
+import lib  # noqa: E402
+
+
+def test_png_scale_limits():
+    assert exporter.png_scale(800, 600) == 1.0
+    # 约5万座位时的原始尺寸
+    width, height = 122272, 5599
+    scale = exporter.png_scale(width, height)
+    assert scale < 1
+    assert (width+1)*scale <= exporter.MAX_IMAGE_SIDE
+    assert (width+1)*scale * (height+1)*scale <= exporter.MAX_IMAGE_PIXELS
+
+
+def test_write_png_reports_save_failure(tmp_path):
+    pytest.importorskip("PySide6")
+    layout_path = tmp_path / "layout.json"
+    layout_path.write_text(json.dumps({
+        "name": "test", "time": "",
+        "map": [{"type": "seats", "start": 0, "length": 2, "text": ""}]
+    }), encoding="utf-8")
+    classs = lib.Classs(lib.Layout_Connector(str(layout_path)))
+    classs.random([lib.Student("甲", "1", True), lib.Student("乙", "2", False)], seed=1)
+
+    exporter.export_classs(str(tmp_path / "ok.png"), classs)
+    assert (tmp_path / "ok.png").stat().st_size > 0
+    with pytest.raises(OSError):
+        exporter.export_classs(str(tmp_path / "missing" / "bad.png"), classs)
@@ -0,0 +1,71 @@
+"""网格格式布局：游程编码与Classs、Compact_Classs的一致性"""
+import json
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lib  # noqa: E402
+
+
+@pytest.mark.parametrize("mask", [
+    [[False, True, True], [True, False, False]],   # 首格不可用
+    [[True, True, False], [False, True, True]],    # 首格可用，第一段长度为0
+    [[True, True], [True, True]],
+    [[False, False], [False, False]],
+])
+def test_runs_round_trip(mask):
+    mask = np.array(mask, dtype=bool)
+    runs = lib.encode_runs(mask)
+    assert sum(runs) == mask.size
+    assert all(length > 0 for length in runs[1:])
+    assert (runs[0] == 0) == bool(mask[0, 0])
+    assert np.array_equal(lib.decode_runs(runs, mask.shape), mask)
+
+
+def test_runs_empty_mask():
+    mask = np.zeros((0, 0), dtype=bool)
+    assert lib.encode_runs(mask) == []
+    assert lib.decode_runs([], (0, 0)).shape == (0, 0)
+
+
+def test_decode_runs_length_mismatch():
+    with pytest.raises(ValueError):
+        lib.decode_runs([1, 2], (2, 2))
+
+
+def make_grid_layout(tmp_path):
+    """5列×4行，第2列为过道，座位中有空缺"""
+    mask = np.ones((5, 4), dtype=bool)
+    mask[0, 0] = False
+    mask[1, 2] = False
+    mask[3, 3] = False
+    mask[4, 1:3] = False
+    path = tmp_path / "grid.json"
+    path.write_text(json.dumps(lib.Layout_Connector.grid_data(mask, [2], "grid", "")), encoding="utf-8")
+    return lib.Layout_Connector(str(path)), mask
+
+
+def test_classs_and_compact_agree_on_grid(tmp_path):
+    layout, mask = make_grid_layout(tmp_path)
+    mask[2] = False
+    classs = lib.Classs(layout)
+    compact = lib.Compact_Classs(layout)
+
+    expected = [tuple(xy) for xy in np.argwhere(mask).tolist()]
+    assert sorted(classs.get_all_avail_seats()) == expected
+    assert sorted(compact.get_all_avail_seats()) == expected
+    assert classs.display_unit() == compact.display_unit() == (5, 5)
+    assert classs.way_gather() == compact.way_gather() == [2]
+
+    stu_list = [lib.Student(f"学生{i}", str(i), i % 2 == 0) for i in range(10)]
+    classs.random(stu_list, seed=42)
+    compact.random(stu_list, seed=42)
+
+    def seats_of(result):
+        return sorted((x, y, stu.id) for x, y, stu in result)
+    assert seats_of(classs.get_result()) == seats_of(compact.get_result())
+    assert all(mask[x, y] for x, y, _ in seats_of(compact.get_result()))
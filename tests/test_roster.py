@@ -0,0 +1,108 @@
+"""学生列表：Excel读取、按学号对比与更新已存储的文件"""
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lib  # noqa: E402
+
+
+def students(*items):
+    return [lib.Student(name, id, sex) for name, id, sex in items]
+
+
+def data_of(stu_list):
+    return [stu.get_data() for stu in stu_list]
+
+
+OLD = students(("甲", "1", True), ("乙", "2", False), ("丙", "3", True))
+
+
+def test_diff_roster():
+    new = students(("丙", "3", True), ("乙二", "2", False), ("丁", "4", False))
+    diff = lib.diff_roster(OLD, new)
+    assert data_of(diff["added"]) == data_of(students(("丁", "4", False)))
+    assert data_of(diff["removed"]) == data_of(students(("甲", "1", True)))
+    assert data_of(diff["changed"]) == data_of(students(("乙二", "2", False)))
+
+
+def test_diff_roster_duplicate_id():
+    with pytest.raises(ValueError):
+        lib.diff_roster(OLD, students(("甲", "1", True), ("乙", "1", False)))
+
+
+def save(tmp_path, ext):
+    """将OLD保存为.json或.roster，返回路径"""
+    path = str(tmp_path / f"一班{ext}")
+    if ext == ".roster":
+        lib.Roster_Store.write(path, OLD, "一班", "2024-01-01 00:00:00")
+    else:
+        with open(path, 'w', encoding='utf-8') as j:
+            json.dump({"name": "一班", "time": "2024-01-01 00:00:00", "stu_list": data_of(OLD)}, j)
+    return path
+
+
+def read_back(path):
+    stu_op = lib.Student_Operate()
+    stu_op.read(path)
+    stu_list = list(stu_op.get_stu_list())
+    if isinstance(stu_op.stu_list, lib.Roster_Store):
+        stu_op.stu_list.close()
+    return stu_op.name, stu_list
+
+
+@pytest.mark.parametrize("ext", [".json", ".roster"])
+def test_update_stored_keeps_order(tmp_path, ext):
+    """原有学生保持顺序，修改就地替换，删除的学生移除，新增的追加在末尾"""
+    path = save(tmp_path, ext)
+    stu_op = lib.Student_Operate()
+    stu_op.stu_list = students(("戊", "5", True), ("丙", "3", True), ("乙二", "2", False), ("丁", "4", False))
+    diff = stu_op.update_stored(path)
+    assert len(diff["added"]) == 2 and len(diff["removed"]) == 1 and len(diff["changed"]) == 1
+
+    name, stu_list = read_back(path)
+    assert name == "一班"
+    assert data_of(stu_list) == data_of(students(
+        ("乙二", "2", False), ("丙", "3", True), ("戊", "5", True), ("丁", "4", False)))
+    assert not os.path.exists(path + ".tmp")
+
+
+@pytest.mark.parametrize("ext", [".json", ".roster"])
+def test_update_stored_unchanged_not_rewritten(tmp_path, ext):
+    path = save(tmp_path, ext)
+    os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+    with open(path, 'rb') as f:
+        content = f.read()
+
+    stu_op = lib.Student_Operate()
+    stu_op.stu_list = list(reversed(OLD))
+    diff = stu_op.update_stored(path)
+    assert diff == {"added": [], "removed": [], "changed": []}
+    assert os.stat(path).st_mtime_ns == 1_000_000_000
+    with open(path, 'rb') as f:
+        assert f.read() == content
+
+
+def test_read_from_xlsx_ids_as_text(tmp_path):
+    """学号列含空单元格时仍按文本读取，空学号的行被跳过"""
+    openpyxl = pytest.importorskip("openpyxl")
+    pytest.importorskip("pandas")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["姓名", "学号", "性别"])
+    sheet.append(["示例", "0", "男"])
+    sheet.append(["甲", 1001, "男"])
+    sheet.append(["乙", None, "女"])
+    sheet.append(["丙", " A02 ", "女"])
+    sheet.append(["丁", " ", "男"])
+    sheet.append(["戊", 20010101, "女"])
+    path = tmp_path / "list.xlsx"
+    workbook.save(path)
+
+    stu_op = lib.Student_Operate()
+    stu_op.read(str(path))
+    assert data_of(stu_op.get_stu_list()) == data_of(students(
+        ("甲", "1001", True), ("丙", "A02", False), ("戊", "20010101", False)))
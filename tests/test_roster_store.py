@@ -0,0 +1,99 @@
+"""列式二进制学生列表（.roster）的写入与读取"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lib  # noqa: E402
+
+
+STU_LIST = [
+    lib.Student("张三", "20240001", True),
+    lib.Student("Zoë Ölmez", "ß-02", False),
+    lib.Student("欧阳·娜娜", "学号３", False),
+    lib.Student("😀", "", True),
+]
+
+
+def write(tmp_path, stu_list, name="高一（1）班"):
+    path = str(tmp_path / "list.roster")
+    lib.Roster_Store.write(path, stu_list, name, "2024-09-01 08:00:00")
+    return path
+
+
+def test_write_then_read(tmp_path):
+    """含非ASCII的姓名、学号及空学号，逐项与原列表一致"""
+    store = lib.Roster_Store(write(tmp_path, STU_LIST))
+    try:
+        assert store.name == "高一（1）班"
+        assert store.time == "2024-09-01 08:00:00"
+        assert len(store) == len(STU_LIST)
+        assert [stu.get_data() for stu in store] == [stu.get_data() for stu in STU_LIST]
+        assert store.name_of(1) == "Zoë Ölmez"
+        assert store.id_of(2) == "学号３"
+    finally:
+        store.close()
+
+
+def test_empty_roster(tmp_path):
+    store = lib.Roster_Store(write(tmp_path, []))
+    try:
+        assert len(store) == 0
+        assert list(store) == []
+        with pytest.raises(IndexError):
+            store[0]
+    finally:
+        store.close()
+
+
+def test_negative_index_and_index_error(tmp_path):
+    store = lib.Roster_Store(write(tmp_path, STU_LIST))
+    try:
+        assert store[-1].get_data() == STU_LIST[-1].get_data()
+        assert store[-len(STU_LIST)].get_data() == STU_LIST[0].get_data()
+        with pytest.raises(IndexError):
+            store[len(STU_LIST)]
+        with pytest.raises(IndexError):
+            store[-len(STU_LIST)-1]
+    finally:
+        store.close()
+
+
+def test_roster_hash_matches_list(tmp_path):
+    store = lib.Roster_Store(write(tmp_path, STU_LIST))
+    try:
+        assert lib.roster_hash(store) == lib.roster_hash(STU_LIST)
+    finally:
+        store.close()
+
+
+def test_invalid_file(tmp_path):
+    path = tmp_path / "bad.roster"
+    path.write_bytes(b"not a roster file")
+    with pytest.raises(ValueError):
+        lib.Roster_Store(str(path))
+
+
+def test_read_dispatches_on_extension(tmp_path):
+    """Student_Operate.read对.roster文件使用Roster_Store，按需创建学生"""
+    stu_op = lib.Student_Operate()
+    stu_op.read(write(tmp_path, STU_LIST))
+    try:
+        assert isinstance(stu_op.get_stu_list(), lib.Roster_Store)
+        assert stu_op.name == "高一（1）班"
+        assert [stu.get_data() for stu in stu_op.get_stu_list()] == [stu.get_data() for stu in STU_LIST]
+    finally:
+        stu_op.get_stu_list().close()
+
+
+def test_read_head_and_catalog_summary(tmp_path):
+    """目录索引只读取头部，不映射文件"""
+    path = write(tmp_path, STU_LIST)
+    head = lib.Roster_Store.read_head(path)
+    assert (head["name"], head["time"], head["count"]) == ("高一（1）班", "2024-09-01 08:00:00", len(STU_LIST))
+    summary = lib.Catalog.summarize(path)
+    assert summary["name"] == "高一（1）班"
+    assert summary["count"] == len(STU_LIST)
+    assert summary["capacity"] is None
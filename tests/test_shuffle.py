@@ -0,0 +1,65 @@
+"""分配引擎的分布检验与Classs输出格式检查"""
+import itertools
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lib  # noqa: E402
+
+
+# 自由度23、显著性0.001时的卡方临界值
+CHI2_CRITICAL_DF23 = 49.728
+
+
+def test_shuffle_assign_uniform_over_injections():
+    """3名学生放入4个座位共24种单射，每种出现的频率应相同"""
+    injections = list(itertools.permutations(range(4), 3))
+    counts = dict.fromkeys(injections, 0)
+    rng = random.Random(20240101)
+    draws = 48000
+    for _ in range(draws):
+        counts[tuple(lib.shuffle_assign(4, 3, rng))] += 1
+
+    expected = draws / len(injections)
+    chi2 = sum((count - expected)**2 / expected for count in counts.values())
+    assert len(counts) == 24
+    assert chi2 < CHI2_CRITICAL_DF23
+
+
+def test_shuffle_assign_reproducible():
+    """相同种子得到相同结果"""
+    assert lib.shuffle_assign(50, 40, random.Random(7)) == lib.shuffle_assign(50, 40, random.Random(7))
+
+
+def test_classs_random_output_shape(tmp_path):
+    """have_random_seats为坐标元组列表，get_processed_data以"(x, y)"为键"""
+    layout_path = tmp_path / "layout.json"
+    layout_path.write_text(json.dumps({
+        "name": "test",
+        "time": "",
+        "map": [
+            {"type": "seats", "start": 0, "length": 3, "text": ""},
+            {"type": "way", "start": 0, "length": 0, "text": "过道"},
+            {"type": "seats", "start": 1, "length": 2, "text": ""}
+        ]
+    }), encoding="utf-8")
+    stu_list = [lib.Student(f"学生{i}", str(i), i % 2 == 0) for i in range(4)]
+
+    classs = lib.Classs(lib.Layout_Connector(str(layout_path)))
+    classs.random(stu_list, seed=1)
+
+    assert classs.have_random
+    assert len(classs.have_random_seats) == len(stu_list)
+    avail = set(classs.get_all_avail_seats())
+    for position in classs.have_random_seats:
+        assert isinstance(position, tuple) and len(position) == 2
+        assert position in avail
+
+    data = classs.get_processed_data()
+    assert set(data) == {str(position) for position in classs.have_random_seats}
+    assert sorted(stu["id"] for stu in data.values()) == ["0", "1", "2", "3"]
+    for stu in data.values():
+        assert set(stu) == {"name", "id", "sex"}
@@ -0,0 +1,146 @@
+"""
+阶段耗时记录（只依赖标准库）
+
+用法:
+    import timing
+    timing.enable()
+    with timing.span("Layout_Connector"):
+        ...
+    timing.export_chrome("trace.json")  # 可在chrome://tracing或Perfetto中打开
+    print(timing.format_summary())
+
+默认关闭，关闭时span只做一次标志判断；也可设置环境变量EASYSEATS_TIMING=1在启动时打开
+"""
+import functools
+import json
+import os
+import threading
+import time
+
+
+_enabled = os.environ.get("EASYSEATS_TIMING") == "1"
+_events = []  # (名称, 开始纳秒, 持续纳秒, 线程id, 参数)
+_lock = threading.Lock()
+
+
+def enable(on: bool = True) -> None:
+    """打开或关闭记录，已记录的数据保留"""
+    global _enabled
+    _enabled = on
+
+
+def disable() -> None:
+    enable(False)
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def clear() -> None:
+    """清除已记录的数据"""
+    with _lock:
+        _events.clear()
+
+
+class _Span():
+    """一次计时，离开with块时记录"""
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name: str, args: dict) -> None:
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        duration = time.perf_counter_ns() - self.start
+        with _lock:
+            _events.append((self.name, self.start, duration, threading.get_ident(), self.args))
+        return False
+
+
+class _Null_Span():
+    """关闭时使用的空计时"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+_NULL_SPAN = _Null_Span()
+
+
+def span(name: str, **args):
+    """计时上下文：with timing.span("random", seats=n): ..."""
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, args)
+
+
+def timed(name: str):
+    """函数装饰器，整个函数调用计为一个span"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def events() -> list:
+    """已记录数据的副本"""
+    with _lock:
+        return list(_events)
+
+
+def export_chrome(path) -> None:
+    """导出为Chrome Trace Event格式的JSON"""
+    pid = os.getpid()
+    trace = []
+    for name, start, duration, tid, args in events():
+        trace.append({
+            "name": name,
+            "ph": "X",
+            "ts": start / 1000,  # 微秒
+            "dur": duration / 1000,
+            "pid": pid,
+            "tid": tid,
+            "args": args
+        })
+    with open(path, 'w', encoding='utf-8') as j:
+        json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, j, ensure_ascii=False)
+
+
+def summary() -> list:
+    """按名称汇总，按总耗时从大到小返回[{name, count, total_ms, mean_ms, max_ms}, ...]"""
+    groups = {}
+    for name, _, duration, _, _ in events():
+        groups.setdefault(name, []).append(duration / 1e6)
+    result = []
+    for name, durations in groups.items():
+        result.append({
+            "name": name,
+            "count": len(durations),
+            "total_ms": round(sum(durations), 3),
+            "mean_ms": round(sum(durations) / len(durations), 3),
+            "max_ms": round(max(durations), 3)
+        })
+    result.sort(key=lambda item: item["total_ms"], reverse=True)
+    return result
+
+
+def format_summary() -> str:
+    """汇总表的文字形式"""
+    lines = [f"{'阶段':<38}{'次数':>6}{'总计ms':>12}{'平均ms':>12}{'最大ms':>12}"]
+    for item in summary():
+        lines.append(f"{item['name']:<40}{item['count']:>8}{item['total_ms']:>14.3f}"
+                     f"{item['mean_ms']:>14.3f}{item['max_ms']:>14.3f}")
+    return "\n".join(lines)